@@ -0,0 +1,238 @@
+"""
+GGY3601 Coding Assignment 2: Assay Cache Module
+
+This module keeps a columnar (Parquet or Feather) copy of an assay CSV file
+so repeated runs can skip CSV parsing.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from assay_schema import assay_dtypes, coerce_assay_columns, csv_read_options
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# Bump when the cached schema changes so stale sidecars are rebuilt.
+CACHE_VERSION = 1
+
+CACHE_FORMATS = ('parquet', 'feather')
+
+# Sidecars are written to this directory next to the source CSV by default.
+DEFAULT_CACHE_DIR = '.assay_cache'
+
+
+def file_fingerprint(filename):
+    """
+    Return the size, modification time and SHA-256 hash of a file.
+
+    Args:
+        filename (str): Path to the file.
+
+    Returns:
+        dict: Keys 'size', 'mtime_ns' and 'sha256'.
+
+    Example:
+        >>> print(file_fingerprint('data/geochemical_assays.csv')['sha256'])
+    """
+    stat = os.stat(filename)
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+            'sha256': digest.hexdigest()}
+
+
+def cache_paths(filename, cache_dir=None, format='parquet'):
+    """
+    Return the (data, key) sidecar paths for a source CSV file.
+
+    Args:
+        filename (str): Path to the source CSV file.
+        cache_dir (str, optional): Directory for the sidecar files. Defaults
+            to DEFAULT_CACHE_DIR next to the source file.
+        format (str): 'parquet' or 'feather'.
+
+    Returns:
+        tuple: (data_path, key_path) as strings.
+    """
+    source_dir, name = os.path.split(os.path.abspath(filename))
+    if cache_dir is None:
+        cache_dir = os.path.join(source_dir, DEFAULT_CACHE_DIR)
+    stem = os.path.splitext(name)[0]
+    data_path = os.path.join(cache_dir, f'{stem}.{format}')
+    return data_path, data_path + '.key.json'
+
+
+def _read_key(key_path):
+    """Read a cache key file, returning None if it is missing or corrupt."""
+    try:
+        with open(key_path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_atomic(path, write):
+    """Write a file via a temporary name so readers never see partial data."""
+    tmp_path = path + '.tmp'
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _write_key(key_path, key):
+    """Write a cache key file atomically."""
+    def write(path):
+        with open(path, 'w') as f:
+            json.dump(key, f)
+    _write_atomic(key_path, write)
+
+
+def is_cache_valid(filename, cache_dir=None, format='parquet'):
+    """
+    Check whether the sidecar cache matches the current source file.
+
+    Size and modification time are compared first. If only the modification
+    time differs (e.g. the file was touched or copied), the content hash
+    decides, and the key is refreshed so the hash is not recomputed on the
+    next load.
+
+    Args:
+        filename (str): Path to the source CSV file.
+        cache_dir (str, optional): Directory for the sidecar files.
+        format (str): 'parquet' or 'feather'.
+
+    Returns:
+        bool: True if the cached data can be used.
+    """
+    data_path, key_path = cache_paths(filename, cache_dir, format)
+    key = _read_key(key_path)
+    if key is None or not os.path.isfile(data_path):
+        return False
+    if key.get('version') != CACHE_VERSION:
+        return False
+
+    stat = os.stat(filename)
+    if key['size'] != stat.st_size:
+        return False
+    if key['mtime_ns'] == stat.st_mtime_ns:
+        return True
+
+    fingerprint = file_fingerprint(filename)
+    if fingerprint['sha256'] != key['sha256']:
+        return False
+    key.update(fingerprint)
+    _write_key(key_path, key)
+    return True
+
+
+def source_hash(filename, cache_dir=None, format='parquet'):
+    """
+    Return the SHA-256 hash of a source file, reusing the sidecar's copy.
+
+    When is_cache_valid accepts the sidecar (normally after comparing only
+    size and modification time), the hash stored in its key is returned and
+    the file is not read again. Otherwise the file is hashed.
+
+    Args:
+        filename (str): Path to the source CSV file.
+        cache_dir (str, optional): Directory for the sidecar files.
+        format (str): 'parquet' or 'feather'.
+
+    Returns:
+        str: Hex digest.
+
+    Example:
+        >>> steps.add_input('data', source_hash('data/geochemical_assays.csv'))
+    """
+    if is_cache_valid(filename, cache_dir, format):
+        key = _read_key(cache_paths(filename, cache_dir, format)[1])
+        if key is not None:
+            return key['sha256']
+    return file_fingerprint(filename)['sha256']
+
+
+def build_cache(filename, cache_dir=None, format='parquet'):
+    """
+    Parse a CSV file and write its columnar sidecar cache.
+
+    Args:
+        filename (str): Path to the source CSV file.
+        cache_dir (str, optional): Directory for the sidecar files.
+        format (str): 'parquet' or 'feather'.
+
+    Returns:
+        pandas.DataFrame: The parsed assay data.
+    """
+    if format not in CACHE_FORMATS:
+        raise ValueError(f"Unknown cache format: {format}")
+
+    fingerprint = file_fingerprint(filename)
+    df = coerce_assay_columns(pd.read_csv(filename, **csv_read_options()))
+
+    data_path, key_path = cache_paths(filename, cache_dir, format)
+    os.makedirs(os.path.dirname(data_path), exist_ok=True)
+    if format == 'parquet':
+        _write_atomic(data_path, lambda path: df.to_parquet(path, index=False))
+    else:
+        _write_atomic(data_path, lambda path: df.to_feather(path))
+    _write_key(key_path, dict(fingerprint, version=CACHE_VERSION, format=format))
+    return df
+
+
+def load_cached_assay_data(filename, columns=None, cache_dir=None,
+                           format='parquet', float32=False):
+    """
+    Load assay data through the columnar sidecar cache.
+
+    On the first call (or after the CSV changes) the CSV is parsed and the
+    cache is rebuilt. Later calls read only the requested columns from the
+    cache. If pyarrow is not installed, the CSV is parsed directly every time.
+
+    Args:
+        filename (str): Path to the source CSV file.
+        columns (list, optional): Columns to read. If None, reads all columns.
+        cache_dir (str, optional): Directory for the sidecar files.
+        format (str): 'parquet' or 'feather'.
+        float32 (bool): If True, return element columns as float32. The cache
+            itself always stores float64.
+
+    Returns:
+        pandas.DataFrame: DataFrame containing the assay data.
+
+    Example:
+        >>> df = load_cached_assay_data('data/geochemical_assays.csv',
+        ...                             columns=['hole_id', 'Au_ppm'])
+    """
+    if not HAS_PYARROW:
+        return coerce_assay_columns(pd.read_csv(filename, **csv_read_options(columns)),
+                                    float32)
+
+    if is_cache_valid(filename, cache_dir, format):
+        data_path, _ = cache_paths(filename, cache_dir, format)
+        if format == 'parquet':
+            df = pd.read_parquet(data_path, columns=columns)
+        else:
+            df = pd.read_feather(data_path, columns=columns)
+    else:
+        df = build_cache(filename, cache_dir, format)
+        if columns is not None:
+            df = df[columns]
+
+    if float32:
+        df = df.astype({column: dtype for column, dtype in assay_dtypes(True).items()
+                        if column in df.columns and dtype == 'float32'})
+    return df
+
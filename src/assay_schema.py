@@ -0,0 +1,215 @@
+"""
+GGY3601 Coding Assignment 2: Assay Schema Module
+
+This module defines the column layout and compact in-memory dtypes for
+geochemical assay data.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import pandas as pd
+import numpy as np
+
+
+# Column layout of the lab assay exports, in file order.
+ASSAY_COLUMNS = [
+    'sample_id', 'hole_id', 'from_depth', 'to_depth', 'lithology',
+    'Au_ppm', 'Cu_pct', 'Ag_ppm', 'Fe_pct', 'S_pct',
+    'sample_quality', 'assay_date',
+]
+
+# Element concentration columns.
+ELEMENT_COLUMNS = ['Au_ppm', 'Cu_pct', 'Ag_ppm', 'Fe_pct', 'S_pct']
+
+# Low-cardinality text columns stored as pandas categoricals.
+CATEGORICAL_COLUMNS = ['hole_id', 'lithology', 'sample_quality']
+
+DEPTH_COLUMNS = ['from_depth', 'to_depth']
+
+DATE_COLUMNS = ['assay_date']
+
+# Dates in the lab exports are always YYYY-MM-DD.
+DATE_FORMAT = '%Y-%m-%d'
+
+DATE_DTYPE = 'datetime64[us]'
+
+
+def assay_dtypes(float32=False):
+    """
+    Return the parse dtypes for the assay columns.
+
+    Categorical columns are parsed straight into categoricals, so the full
+    string column is never built. Dates are not listed here; they are
+    converted by coerce_assay_columns (dtype DATE_DTYPE).
+
+    Args:
+        float32 (bool): If True, store element concentrations as float32
+            instead of float64 (halves their memory; about 7 significant
+            digits are kept, well beyond assay precision). Depths always
+            stay float64 so interval lengths are exact.
+
+    Returns:
+        dict: Mapping of column name to dtype, suitable for pd.read_csv().
+
+    Example:
+        >>> dtypes = assay_dtypes(float32=True)
+        >>> print(dtypes['Au_ppm'])
+        float32
+    """
+    element_dtype = 'float32' if float32 else 'float64'
+    dtypes = {'sample_id': str}
+    for column in CATEGORICAL_COLUMNS:
+        dtypes[column] = 'category'
+    for column in DEPTH_COLUMNS:
+        dtypes[column] = 'float64'
+    for column in ELEMENT_COLUMNS:
+        dtypes[column] = element_dtype
+    return dtypes
+
+
+# Default parse dtypes (float64 elements).
+ASSAY_DTYPES = assay_dtypes()
+
+
+def csv_read_options(columns=None):
+    """
+    Return the pd.read_csv() keyword arguments that parse the compact schema.
+
+    Only the text columns get a dtype here. Element, depth and date columns
+    are left for pandas to infer and are then converted by
+    coerce_assay_columns, so a single bad cell cannot fail the whole read.
+
+    Args:
+        columns (list, optional): Only parse these columns. The options then
+            include usecols, and dtypes are limited to the subset.
+
+    Returns:
+        dict: Keyword arguments (dtype, and usecols when columns is given).
+
+    Example:
+        >>> df = coerce_assay_columns(
+        ...     pd.read_csv('data/geochemical_assays.csv', **csv_read_options()))
+    """
+    dtypes = {column: dtype for column, dtype in assay_dtypes().items()
+              if column not in DEPTH_COLUMNS + ELEMENT_COLUMNS}
+    if columns is None:
+        return {'dtype': dtypes}
+    return {'usecols': list(columns),
+            'dtype': {c: d for c, d in dtypes.items() if c in columns}}
+
+
+def coerce_assay_columns(df, float32=False):
+    """
+    Convert the numeric and date columns of an assay frame to the schema.
+
+    Depth and element columns go through pd.to_numeric and dates through
+    pd.to_datetime, both with errors='coerce': a cell that is not a number
+    (e.g. a below-detection-limit '<0.01') becomes NaN and a date that is
+    not YYYY-MM-DD (e.g. 'pending') becomes NaT, so the column dtypes are
+    always the same. Columns missing from the frame are skipped.
+
+    Args:
+        df (pandas.DataFrame): Frame as parsed by pd.read_csv.
+        float32 (bool): If True, store element columns as float32.
+
+    Returns:
+        pandas.DataFrame: df with converted columns (df itself if nothing
+            needed converting).
+
+    Example:
+        >>> raw = pd.read_csv('data/geochemical_assays.csv', **csv_read_options())
+        >>> df = coerce_assay_columns(raw)
+    """
+    dtypes = assay_dtypes(float32)
+    converted = {}
+    for column in DEPTH_COLUMNS + ELEMENT_COLUMNS:
+        if column in df.columns and df[column].dtype != dtypes[column]:
+            values = df[column]
+            if not pd.api.types.is_numeric_dtype(values):
+                values = pd.to_numeric(values, errors='coerce')
+            converted[column] = values.astype(dtypes[column])
+    for column in DATE_COLUMNS:
+        if column in df.columns and not pd.api.types.is_datetime64_any_dtype(df[column]):
+            converted[column] = pd.to_datetime(df[column], format=DATE_FORMAT,
+                                               errors='coerce').astype(DATE_DTYPE)
+    return df.assign(**converted) if converted else df
+
+
+def apply_assay_schema(df, float32=False):
+    """
+    Convert an assay DataFrame to the compact schema.
+
+    Use this on frames that were not loaded through load_assay_data (e.g.
+    built with a plain pd.read_csv). Columns that are missing from the frame
+    are skipped, and other columns are left untouched.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        float32 (bool): If True, store element columns as float32.
+
+    Returns:
+        pandas.DataFrame: A new DataFrame using the compact dtypes.
+
+    Example:
+        >>> raw = pd.read_csv('data/geochemical_assays.csv')
+        >>> compact = apply_assay_schema(raw, float32=True)
+        >>> print(compact.dtypes)
+    """
+    result = df.astype({column: 'category' for column in CATEGORICAL_COLUMNS
+                        if column in df.columns})
+    return coerce_assay_columns(result, float32)
+
+
+def concat_assay_chunks(frames):
+    """
+    Concatenate parsed chunks without losing categorical dtypes.
+
+    Each chunk read with the compact schema has its own set of categories,
+    and pd.concat falls back to object columns when they differ. The
+    categories are unioned here instead. Row labels are kept as they are.
+
+    Args:
+        frames (list): DataFrames with the same columns.
+
+    Returns:
+        pandas.DataFrame: The concatenated chunks.
+    """
+    categorical = [column for column in frames[0].columns
+                   if isinstance(frames[0][column].dtype, pd.CategoricalDtype)]
+    df = pd.concat(frames)
+    for column in categorical:
+        df[column] = pd.api.types.union_categoricals(
+            [frame[column] for frame in frames], sort_categories=True)
+    return df
+
+
+def memory_savings(before, after):
+    """
+    Report the memory saved per column between two versions of a frame.
+
+    Memory is measured with ``deep=True`` so string and categorical storage
+    is counted in full.
+
+    Args:
+        before (pandas.DataFrame): Original DataFrame.
+        after (pandas.DataFrame): Converted DataFrame with the same columns.
+
+    Returns:
+        pandas.DataFrame: One row per column with 'before_bytes',
+            'after_bytes', 'saved_bytes' and 'ratio' (before / after),
+            plus a 'total' row.
+
+    Example:
+        >>> raw = pd.read_csv('data/geochemical_assays.csv')
+        >>> print(memory_savings(raw, apply_assay_schema(raw, float32=True)))
+    """
+    before_bytes = before.memory_usage(index=False, deep=True)
+    after_bytes = after.memory_usage(index=False, deep=True)
+    report = pd.DataFrame({'before_bytes': before_bytes,
+                           'after_bytes': after_bytes.reindex(before_bytes.index)})
+    report.loc['total'] = report.sum()
+    report['saved_bytes'] = report['before_bytes'] - report['after_bytes']
+    report['ratio'] = report['before_bytes'] / report['after_bytes'].replace(0, np.nan)
+    return report
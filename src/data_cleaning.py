@@ -8,11 +8,18 @@ Student ID: [YOUR ID]
 Date: [DATE]
 """
 
+import time
+
 import pandas as pd
 import numpy as np
 
+from depth_index import get_depth_index, sort_by_hole_depth
+from grouped_stats import get_group_index, grouped_statistics
+from streaming_stats import QuantileSketch, iter_frames
+
 
-def handle_missing_values(df, strategy='drop', columns=None):
+def handle_missing_values(df, strategy='drop', columns=None, by=None, inplace=False,
+                          interpolation='linear', max_gap=None):
     """
     Handle missing values in the DataFrame.
 
@@ -20,6 +27,21 @@ def handle_missing_values(df, strategy='drop', columns=None):
     values in geochemical data. The appropriate strategy depends on the
     analysis requirements and the nature of the missing data.
 
+    With ``by``, 'mean' and 'median' fill each gap with the statistic of
+    the sample's own group (e.g. its drill hole or lithology). The group
+    statistics of all columns come from one grouped_statistics call and are
+    written back with a single vectorized scatter, instead of one groupby
+    per column. Groups with no values for a column, and rows with a missing
+    group key, keep their gaps.
+
+    'downhole' fills each gap from the nearest known samples above and
+    below it in the same hole, using interval midpoints as positions. Rows
+    are sorted once by hole and depth, and the neighbours of every gap in
+    every hole and column are found together with running maximum and
+    minimum scans, so there is no loop over holes. Gaps above the first or
+    below the last known sample in a hole take that sample's value, as
+    with numpy.interp.
+
     Args:
         df (pandas.DataFrame): DataFrame containing assay data.
         strategy (str): Strategy for handling missing values:
@@ -27,29 +49,151 @@ def handle_missing_values(df, strategy='drop', columns=None):
             - 'mean': Replace missing values with column mean
             - 'median': Replace missing values with column median
             - 'zero': Replace missing values with 0
+            - 'downhole': Interpolate from neighbouring samples in the
+              same hole
         columns (list, optional): List of columns to apply the strategy to.
             If None, applies to all numeric columns.
+        by (str or list, optional): Grouping column(s) for 'mean' and
+            'median', e.g. 'hole_id' or 'lithology'.
+        inplace (bool): If True, modify df instead of returning a copy.
+            Only the filled columns are replaced; the rest of the frame is
+            not copied.
+        interpolation (str): For 'downhole', 'linear' (between the
+            neighbours above and below, by midpoint depth) or 'nearest'.
+        max_gap (float, optional): For 'downhole', only use neighbours
+            whose midpoint is at most this many metres away. Gaps with no
+            such neighbour are left missing.
 
     Returns:
         pandas.DataFrame: DataFrame with missing values handled according
-            to the specified strategy.
+            to the specified strategy, or None if inplace is True.
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> print(f"Before: {df['Au_ppm'].isna().sum()} missing")
         >>> df_clean = handle_missing_values(df, strategy='median')
         >>> print(f"After: {df_clean['Au_ppm'].isna().sum()} missing")
+        >>> handle_missing_values(df, 'median', by='hole_id', inplace=True)
+        >>> df_interp = handle_missing_values(df, 'downhole', ['Au_ppm'], max_gap=5.0)
     """
-    # TODO: Implement this function
-    # Hint:
-    # - For 'drop': Use df.dropna()
-    # - For 'mean': Use df.fillna(df.mean())
-    # - For 'median': Use df.fillna(df.median())
-    # - For 'zero': Use df.fillna(0)
-    pass
-
-
-def remove_outliers(df, element, method='iqr', threshold=1.5):
+    if by is not None and strategy not in ('mean', 'median'):
+        raise ValueError("by is only supported for the 'mean' and 'median' strategies")
+    if strategy == 'drop':
+        if inplace:
+            df.dropna(subset=columns, inplace=True)
+            return None
+        return df.dropna(subset=columns)
+
+    if columns is None:
+        keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        if strategy == 'downhole':
+            keys = ['from_depth', 'to_depth']
+        columns = [column for column in df.select_dtypes(include='number').columns
+                   if column not in keys]
+    if strategy not in ('mean', 'median', 'zero', 'downhole'):
+        raise ValueError(f"Unknown missing value strategy: {strategy}")
+
+    if strategy == 'downhole':
+        filled = _downhole_fill(df, columns, interpolation, max_gap)
+    elif by is not None:
+        filled = _group_fill(df, columns, by, strategy)
+    else:
+        if strategy == 'mean':
+            fill = df[columns].mean()
+        elif strategy == 'median':
+            fill = df[columns].median()
+        else:
+            fill = {column: 0 for column in columns}
+        if not inplace:
+            return df.fillna(fill)
+        filled = {column: df[column].fillna(fill[column]) for column in columns
+                  if df[column].hasnans}
+
+    if not inplace:
+        # Only the filled columns are new; the others are shared with df
+        return df.assign(**filled)
+    for column, values in filled.items():
+        df[column] = values
+    return None
+
+
+def _group_fill(df, columns, by, strategy):
+    """Fill gaps with group means or medians; returns {column: filled values}."""
+    statistic = 'mean' if strategy == 'mean' else '50%'
+    index = get_group_index(df, by)
+    stats = grouped_statistics(df, by, columns, stats=[statistic])
+    fill = stats.xs(statistic, axis=1, level=1)[columns].to_numpy(dtype='float64')
+
+    block = df[columns].to_numpy(dtype='float64', na_value=np.nan, copy=True)
+    rows, cols = np.nonzero(np.isnan(block) & (index.codes >= 0)[:, None])
+    block[rows, cols] = fill[index.codes[rows], cols]
+    return _filled_columns(df, columns, block, np.unique(cols))
+
+
+def _downhole_fill(df, columns, interpolation, max_gap):
+    """Interpolate gaps between neighbouring samples of each hole."""
+    if interpolation not in ('linear', 'nearest'):
+        raise ValueError(f"Unknown interpolation: {interpolation}")
+    order, codes, from_depth, to_depth = sort_by_hole_depth(df)
+    block = df[columns].to_numpy(dtype='float64', na_value=np.nan, copy=True)
+    values = block[order]
+    if max_gap is None:
+        max_gap = np.inf
+    middle = (from_depth + to_depth) / 2
+    n = len(order)
+    rows = np.arange(n)[:, None]
+    known = ~np.isnan(values)
+
+    # Nearest known row above and below each row, per column, within the hole
+    above = np.maximum.accumulate(np.where(known, rows, -1), axis=0)
+    below = np.minimum.accumulate(np.where(known, rows, n)[::-1], axis=0)[::-1]
+    missing_rows, cols = np.nonzero(~known)
+    above = above[missing_rows, cols]
+    below = below[missing_rows, cols]
+    hole = codes[missing_rows]
+    depth = middle[missing_rows]
+    has_above = (above >= 0) & (codes[np.maximum(above, 0)] == hole)
+    has_below = (below < n) & (codes[np.minimum(below, n - 1)] == hole)
+    above = np.maximum(above, 0)
+    below = np.minimum(below, n - 1)
+    distance_above = np.where(has_above, depth - middle[above], np.inf)
+    distance_below = np.where(has_below, middle[below] - depth, np.inf)
+    has_above &= distance_above <= max_gap
+    has_below &= distance_below <= max_gap
+
+    value_above = values[above, cols]
+    value_below = values[below, cols]
+    if interpolation == 'nearest':
+        use_above = has_above & ~(has_below & (distance_below < distance_above))
+        fill = np.where(use_above, value_above, value_below)
+    else:
+        span = distance_above + distance_below
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(span > 0, distance_above / span, 0.0)
+        fill = np.where(has_above & has_below,
+                        value_above + (value_below - value_above) * weight,
+                        np.where(has_above, value_above, value_below))
+    fillable = has_above | has_below
+
+    block[order[missing_rows[fillable]], cols[fillable]] = fill[fillable]
+    return _filled_columns(df, columns, block, np.unique(cols[fillable]))
+
+
+def _filled_columns(df, columns, block, changed):
+    """Turn the changed columns of a filled block into Series."""
+    filled = {}
+    for j in changed:
+        column = columns[j]
+        dtype = df[column].dtype
+        values = block[:, j]
+        if isinstance(dtype, np.dtype) and dtype.kind == 'f':
+            values = values.astype(dtype, copy=False)
+        filled[column] = pd.Series(values, index=df.index, name=column)
+    return filled
+
+
+def remove_outliers(df, element, method='iqr', threshold=1.5, quantiles='exact',
+                    rule='any'):
     """
     Remove statistical outliers from the data.
 
@@ -58,34 +202,233 @@ def remove_outliers(df, element, method='iqr', threshold=1.5):
     geochemical data may represent errors or genuine anomalies - careful
     consideration is needed before removing them.
 
+    Several elements can be cleaned at once: the bounds of all of them come
+    from one batched computation over the element columns, the rejections
+    are combined with ``rule`` and the frame is copied once at the end.
+    Every element's bounds are computed from all rows of df, so the result
+    can differ slightly from removing the elements one after another.
+
     Args:
         df (pandas.DataFrame): DataFrame containing assay data.
-        element (str): Column name for the element to check for outliers.
+        element (str or list): Column name for the element to check for
+            outliers, or a list of element columns.
         method (str): Method for detecting outliers:
             - 'iqr': Interquartile Range method (Q1 - 1.5*IQR to Q3 + 1.5*IQR)
             - 'zscore': Z-score method (values beyond threshold std from mean)
         threshold (float): Threshold for outlier detection:
             - For 'iqr': IQR multiplier (default 1.5)
             - For 'zscore': Number of standard deviations (default 3.0)
+        quantiles (str): How Q1 and Q3 are found for the 'iqr' method:
+            'exact' (full sort, default) or 'sketch' (bounded-memory
+            QuantileSketch, for very large columns).
+        rule (str): For a list of elements, drop a row if it is an outlier
+            for 'any' of them (default) or only for 'all' of them.
 
     Returns:
-        pandas.DataFrame: DataFrame with outliers removed.
+        pandas.DataFrame: DataFrame with outliers removed. For a list of
+            elements, outlier_rejections gives which element rejected each
+            row.
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> print(f"Before: {len(df)} samples")
         >>> df_clean = remove_outliers(df, 'Au_ppm', method='iqr')
         >>> print(f"After: {len(df_clean)} samples")
+        >>> elements = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
+        >>> df_clean = remove_outliers(df, elements, rule='all')
+        >>> rejected = outlier_rejections(df, elements)
+        >>> print(rejected[:, 0].sum(), "rows rejected for Au_ppm")
     """
-    # TODO: Implement this function
-    # Hint for IQR method:
-    # Q1 = df[element].quantile(0.25)
-    # Q3 = df[element].quantile(0.75)
-    # IQR = Q3 - Q1
-    # lower_bound = Q1 - threshold * IQR
-    # upper_bound = Q3 + threshold * IQR
-    # Filter: df[(df[element] >= lower_bound) & (df[element] <= upper_bound)]
-    pass
+    return df[outlier_mask(df, element, method, threshold, quantiles, rule=rule)]
+
+
+def _combine_rejections(rejected, rule):
+    """Rows to keep given a rows x elements rejection matrix."""
+    if rule == 'any':
+        return ~rejected.any(axis=1)
+    if rule == 'all':
+        return ~rejected.all(axis=1)
+    raise ValueError(f"Unknown outlier rule: {rule}")
+
+
+def outlier_rejections(df, elements, method='iqr', threshold=1.5, quantiles='exact',
+                       rows=None):
+    """
+    Rejection matrix for several elements, with all bounds computed together.
+
+    Exact quartiles come from one sort of the element block along the rows
+    (NaN last), reading each column's order statistics at its own count of
+    values; z-score bounds from one nanmean/nanstd over the block.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        elements (list): Element columns to check.
+        method (str): 'iqr' or 'zscore', as in remove_outliers.
+        threshold (float): IQR multiplier or number of standard deviations.
+        quantiles (str): 'exact' or 'sketch', as in remove_outliers.
+        rows (numpy.ndarray, optional): Boolean mask of the rows to compute
+            the bounds from. Defaults to all rows.
+
+    Returns:
+        numpy.ndarray: Boolean array of shape (len(df), len(elements)),
+            True where the value is outside the bounds or missing.
+    """
+    block = df[elements].to_numpy(dtype='float64', na_value=np.nan)
+    sample = block if rows is None else block[rows]
+    counts = (~np.isnan(sample)).sum(axis=0)
+    if method == 'iqr':
+        if quantiles == 'sketch':
+            q1, q3 = np.array([
+                QuantileSketch().update(column[~np.isnan(column)]).quantile([0.25, 0.75])
+                for column in sample.T]).T
+        elif quantiles == 'exact':
+            q1, q3 = _batched_quantiles(sample, counts, [0.25, 0.75])
+        else:
+            raise ValueError(f"Unknown quantiles mode: {quantiles}")
+        iqr = q3 - q1
+        lower_bound = q1 - threshold * iqr
+        upper_bound = q3 + threshold * iqr
+    elif method == 'zscore':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_val = np.nansum(sample, axis=0) / counts
+            deviations = np.where(np.isnan(sample), 0.0, sample - mean_val)
+            std_val = np.sqrt((deviations ** 2).sum(axis=0) / (counts - 1))
+        std_val = np.where(counts > 1, std_val, np.nan)
+        lower_bound = mean_val - threshold * std_val
+        upper_bound = mean_val + threshold * std_val
+    else:
+        raise ValueError(f"Unknown outlier method: {method}")
+    return ~((block >= lower_bound) & (block <= upper_bound))
+
+
+def _batched_quantiles(block, counts, qs):
+    """Linear-interpolated quantiles of each column of a block, ignoring NaN."""
+    if len(block) == 0:
+        return [np.full(block.shape[1], np.nan) for _ in qs]
+    # Sort each column as one contiguous row of the transpose; NaN sort last
+    ordered = np.sort(block.T, axis=1)
+    columns = np.arange(block.shape[1])
+    result = []
+    for q in qs:
+        position = q * np.maximum(counts - 1, 0)
+        lower = np.floor(position).astype(np.int64)
+        low = ordered[columns, lower]
+        high = ordered[columns, np.ceil(position).astype(np.int64)]
+        result.append(np.where(counts > 0, low + (high - low) * (position - lower), np.nan))
+    return result
+
+
+def outlier_mask(df, element, method='iqr', threshold=1.5, quantiles='exact',
+                 rows=None, rule='any'):
+    """
+    Boolean mask of the rows remove_outliers would keep.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        element (str or list): Element column(s) to check for outliers.
+        method (str): 'iqr' or 'zscore', as in remove_outliers.
+        threshold (float): IQR multiplier or number of standard deviations.
+        quantiles (str): 'exact' or 'sketch', as in remove_outliers.
+        rows (numpy.ndarray, optional): Boolean mask of the rows to consider.
+            The bounds are computed from these rows only and every other row
+            is False, which gives the same result as calling remove_outliers
+            on df[rows].
+        rule (str): 'any' or 'all', as in remove_outliers.
+
+    Returns:
+        numpy.ndarray: Boolean array with one entry per row of df.
+    """
+    elements = [element] if isinstance(element, str) else list(element)
+    rejected = outlier_rejections(df, elements, method, threshold, quantiles, rows)
+    mask = _combine_rejections(rejected, rule)
+    if rows is not None:
+        mask &= rows
+    return mask
+
+
+# Checks run by validate_data_quality, in report order.
+VALIDATION_CHECKS = ('missing_values', 'duplicate_ids', 'negative_values',
+                     'invalid_depths', 'rejected_samples')
+
+def _column_arrays(chunk):
+    """Return {column: (kind, values)} with NumPy data for each column."""
+    arrays = {}
+    for column in chunk.columns:
+        series = chunk[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            arrays[column] = ('category', series)
+        elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'iufmM':
+            arrays[column] = (series.dtype.kind, series.to_numpy())
+        else:
+            arrays[column] = ('object', series)
+    return arrays
+
+
+def _count_missing(kind, values):
+    """Count missing entries of a column from _column_arrays."""
+    if kind == 'f':
+        return int(np.isnan(values).sum())
+    if kind in 'mM':
+        return int(np.isnat(values).sum())
+    if kind == 'category':
+        return int((values.cat.codes.to_numpy() < 0).sum())
+    if kind == 'object':
+        return int(values.isna().sum())
+    return 0
+
+
+def _hash_ids(series):
+    """Hash sample IDs to uint64 with pandas' row hashing; equal IDs get equal hashes."""
+    return pd.util.hash_pandas_object(series, index=False).to_numpy()
+
+
+class _SeenHashes:
+    """
+    Set of the sample ID hashes seen so far.
+
+    Hashes are kept as a few sorted uint64 runs whose sizes at least halve
+    from one run to the next; a new run is merged into the previous ones
+    while it is at least as long, so adding n hashes costs O(n log n)
+    overall and a lookup is one searchsorted per run.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def add(self, hashes):
+        """
+        Add hashes to the set.
+
+        Returns:
+            numpy.ndarray: Mask of the hashes that were already in the set
+                or appear earlier in this batch.
+        """
+        order = np.argsort(hashes, kind='stable')
+        ordered = hashes[order]
+        repeated = np.zeros(len(hashes), dtype=bool)
+        repeated[1:] = ordered[1:] == ordered[:-1]
+        for run in self.runs:
+            # Sorted queries keep searchsorted cache-friendly
+            positions = np.minimum(np.searchsorted(run, ordered), len(run) - 1)
+            repeated |= run[positions] == ordered
+        again = np.empty(len(hashes), dtype=bool)
+        again[order] = repeated
+        new = ordered[~repeated]
+        if len(new):
+            while self.runs and len(self.runs[-1]) <= len(new):
+                new = np.sort(np.concatenate([self.runs.pop(), new]))
+            self.runs.append(new)
+        return again
+
+
+def _count_equal(kind, values, target):
+    """Count entries equal to a string target (compares codes for categoricals)."""
+    if kind == 'category':
+        categories = values.cat.categories
+        if target not in categories:
+            return 0
+        return int((values.cat.codes.to_numpy() == categories.get_loc(target)).sum())
+    return int((values == target).sum())
 
 
 def validate_data_quality(df):
@@ -96,8 +439,27 @@ def validate_data_quality(df):
     a report of any issues found. This is essential for ensuring reliable
     geochemical analysis.
 
+    All checks run in one pass over each chunk's NumPy columns. For a single
+    DataFrame, duplicate sample IDs come from pandas' hash table
+    (Series.duplicated). For chunked input only a 64-bit hash of each ID is
+    kept, so memory grows by 8 bytes per row rather than by the ID strings.
+    Chunks are processed and released one at a time. Rows whose hash was
+    already seen are resolved as follows:
+
+    - A re-iterable source (a list of chunks or an AssayChunkReader) is read
+      a second time, and only the IDs behind repeated hashes are compared
+      by value, so hash collisions cannot produce false duplicates.
+    - A one-shot source (e.g. a generator) cannot be read again, so the ID
+      strings of those rows are kept and reported. Their first occurrence
+      is matched by hash alone; a false duplicate would need two distinct
+      IDs with the same 64-bit hash.
+
+    Checks whose columns are missing from the data are skipped.
+
     Args:
-        df (pandas.DataFrame): DataFrame containing assay data.
+        df (pandas.DataFrame or iterable): DataFrame containing assay data,
+            or an iterable of DataFrame chunks (e.g. from
+            load_assay_data(..., chunksize=...)).
 
     Returns:
         dict: Data quality report containing:
@@ -108,6 +470,7 @@ def validate_data_quality(df):
             - 'invalid_depths': Count of samples where from_depth >= to_depth
             - 'rejected_samples': Count of samples with 'Rejected' quality
             - 'issues_found': Boolean indicating if any issues were found
+            - 'timings': Dict of check name to {'seconds', 'rows_per_sec'}
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
@@ -118,9 +481,186 @@ def validate_data_quality(df):
         ...         if count > 0:
         ...             print(f"  {col}: {count} missing values")
     """
-    # TODO: Implement this function
-    # Hint: Check for various issues and compile into a report dictionary
-    pass
+    single_frame = isinstance(df, pd.DataFrame)
+    one_shot = not single_frame and iter(df) is df
+    total_rows = 0
+    duplicate_ids = []
+    missing = {}
+    negative = {}
+    invalid_depths = 0
+    rejected = 0
+    seen = _SeenHashes()
+    repeated = []
+    seconds = dict.fromkeys(VALIDATION_CHECKS, 0.0)
+
+    for chunk in iter_frames(df):
+        total_rows += len(chunk)
+        arrays = _column_arrays(chunk)
+
+        start = time.perf_counter()
+        for column, (kind, values) in arrays.items():
+            missing[column] = missing.get(column, 0) + _count_missing(kind, values)
+        seconds['missing_values'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if 'sample_id' in chunk.columns:
+            ids = chunk['sample_id']
+            if single_frame:
+                duplicate_ids = list(ids[ids.duplicated()].unique())
+            else:
+                hashes = _hash_ids(ids)
+                again = seen.add(hashes)
+                if again.any():
+                    # Keep copied IDs only for a one-shot source, so the
+                    # chunk itself can be freed
+                    repeated.append(ids[again].copy() if one_shot else hashes[again])
+        seconds['duplicate_ids'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        for column, (kind, values) in arrays.items():
+            if kind in 'iuf':
+                negative[column] = negative.get(column, 0) + int((values < 0).sum())
+        seconds['negative_values'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if 'from_depth' in arrays and 'to_depth' in arrays:
+            from_depth = chunk['from_depth'].to_numpy(dtype='float64', na_value=np.nan)
+            to_depth = chunk['to_depth'].to_numpy(dtype='float64', na_value=np.nan)
+            invalid_depths += int((from_depth >= to_depth).sum())
+        seconds['invalid_depths'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        if 'sample_quality' in arrays:
+            rejected += _count_equal(*arrays['sample_quality'], 'Rejected')
+        seconds['rejected_samples'] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    if repeated and one_shot:
+        duplicate_ids = list(pd.concat(repeated).unique())
+    elif repeated:
+        # Second pass: compare the IDs behind repeated hashes by value
+        repeated = np.unique(np.concatenate(repeated))
+        candidates = pd.concat([chunk['sample_id'][np.isin(_hash_ids(chunk['sample_id']),
+                                                            repeated)]
+                                for chunk in iter_frames(df)])
+        duplicate_ids = list(candidates[candidates.duplicated()].unique())
+    seconds['duplicate_ids'] += time.perf_counter() - start
+
+    report = {
+        'total_rows': total_rows,
+        'missing_values': missing,
+        'duplicate_ids': duplicate_ids,
+        'negative_values': {column: count for column, count in negative.items() if count > 0},
+        'invalid_depths': invalid_depths,
+        'rejected_samples': rejected,
+    }
+    report['issues_found'] = bool(
+        any(report['missing_values'].values()) or report['duplicate_ids']
+        or report['negative_values'] or report['invalid_depths'])
+    report['timings'] = {
+        check: {'seconds': elapsed,
+                'rows_per_sec': total_rows / elapsed if elapsed > 0 else 0.0}
+        for check, elapsed in seconds.items()}
+    return report
+
+
+INTERVAL_CONFLICT_COLUMNS = ['hole_id', 'kind', 'upper_sample_id', 'lower_sample_id',
+                             'from_depth', 'to_depth', 'length']
+
+
+def find_interval_conflicts(df, tolerance=0.0):
+    """
+    Find overlapping and gapped sample intervals within each drill hole.
+
+    Intervals are sorted once by (hole_id, from_depth). Every pair of
+    intervals in a hole that overlaps is reported, not just neighbours: the
+    intervals overlapping one that ends at to_depth are exactly those after
+    it (in sorted order) whose from_depth is less than that to_depth, so one
+    searchsorted call over a key that gives each hole its own depth band
+    (as in DepthIndex) counts them for every interval at once. A gap is
+    reported where an interval starts below the deepest to_depth seen so
+    far in its hole. The cost is O(n log n) plus the number of conflicts.
+
+    Rows with a missing hole_id or depth are ignored. Inverted intervals
+    (from_depth >= to_depth) are reported by validate_data_quality instead.
+
+    Args:
+        df (pandas.DataFrame): DataFrame with sample_id, hole_id, from_depth
+            and to_depth.
+        tolerance (float): Overlaps and gaps of at most this many metres
+            are ignored, e.g. to allow for rounding in the exports.
+
+    Returns:
+        pandas.DataFrame: One row per conflict, ordered by hole and depth,
+            with columns:
+            - 'hole_id': Drill hole
+            - 'kind': 'overlap' or 'gap'
+            - 'upper_sample_id': The shallower interval of the pair
+            - 'lower_sample_id': The deeper interval of the pair
+            - 'from_depth', 'to_depth': The doubly sampled or unsampled
+              depth range
+            - 'length': Its length in metres
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> conflicts = find_interval_conflicts(df, tolerance=0.01)
+        >>> print(conflicts[conflicts['kind'] == 'overlap'])
+    """
+    order, codes, from_depth, to_depth = sort_by_hole_depth(df)
+    n = len(order)
+    rows = np.arange(n)
+    if n:
+        low = min(from_depth.min(), to_depth.min())
+        span = max(from_depth.max(), to_depth.max()) - low + tolerance + 1.0
+    else:
+        low, span = 0.0, 1.0
+    band = codes * span - low
+
+    # Overlaps: intervals after i in the same hole that start above to_depth[i]
+    # The search key is rounded, so search slightly past to_depth[i] and
+    # compare the exact depths below
+    reach = band + to_depth
+    end = np.searchsorted(band + from_depth, reach + 4 * np.finfo(float).eps * np.abs(reach),
+                          side='right')
+    counts = np.maximum(end - rows - 1, 0)
+    upper = np.repeat(rows, counts)
+    lower = upper + 1 + np.arange(len(upper)) - np.repeat(np.cumsum(counts) - counts, counts)
+    overlap_from = from_depth[lower]
+    overlap_to = np.minimum(to_depth[upper], to_depth[lower])
+    # Keep candidates overlapping by more than the tolerance; a lower
+    # interval may start above to_depth[i] but end inside the upper one
+    real = overlap_to - overlap_from > tolerance
+    upper, lower = upper[real], lower[real]
+    overlap_from, overlap_to = overlap_from[real], overlap_to[real]
+
+    # Gaps: the next interval starts below the deepest to_depth so far
+    deepest = np.maximum.accumulate(np.where(reach == np.maximum.accumulate(reach), rows, 0))
+    same_hole = codes[1:] == codes[:-1]
+    gap = same_hole & (from_depth[1:] - to_depth[deepest[:-1]] > tolerance)
+    gap_upper = deepest[:-1][gap]
+    gap_lower = rows[1:][gap]
+    gap_from = to_depth[gap_upper]
+    gap_to = from_depth[gap_lower]
+
+    upper = np.concatenate([upper, gap_upper])
+    lower = np.concatenate([lower, gap_lower])
+    conflict_from = np.concatenate([overlap_from, gap_from])
+    conflict_to = np.concatenate([overlap_to, gap_to])
+    kind = np.repeat(np.array(['overlap', 'gap'], dtype=object), [len(overlap_from), len(gap_from)])
+    sort = np.argsort(band[upper] + conflict_from, kind='stable')
+    upper, lower, kind = upper[sort], lower[sort], kind[sort]
+    conflict_from, conflict_to = conflict_from[sort], conflict_to[sort]
+
+    sample_ids = df['sample_id'].array
+    return pd.DataFrame({
+        'hole_id': df['hole_id'].array.take(order[upper]),
+        'kind': kind,
+        'upper_sample_id': sample_ids.take(order[upper]),
+        'lower_sample_id': sample_ids.take(order[lower]),
+        'from_depth': conflict_from,
+        'to_depth': conflict_to,
+        'length': conflict_to - conflict_from,
+    }, columns=INTERVAL_CONFLICT_COLUMNS)
 
 
 def standardize_lithology_names(df):
@@ -143,12 +683,21 @@ def standardize_lithology_names(df):
         >>> df_clean = standardize_lithology_names(df)
         >>> print(df_clean['lithology'].unique())
     """
-    # TODO: Implement this function
-    # Hint: Use df['lithology'].str.title()
-    pass
-
-
-def filter_by_depth_range(df, min_depth=None, max_depth=None):
+    df = df.copy()
+    lithology = df['lithology']
+    if isinstance(lithology.dtype, pd.CategoricalDtype):
+        # Title-case each category once instead of every row, then merge
+        # categories that now share a name (e.g. 'granite' and 'GRANITE').
+        new_codes, categories = pd.factorize(lithology.cat.categories.str.title())
+        codes = lithology.cat.codes.to_numpy()
+        codes = np.where(codes >= 0, new_codes[codes], -1)
+        df['lithology'] = pd.Categorical.from_codes(codes, categories=categories)
+    else:
+        df['lithology'] = lithology.str.title()
+    return df
+
+
+def filter_by_depth_range(df, min_depth=None, max_depth=None, use_index=False):
     """
     Filter samples by depth range.
 
@@ -162,19 +711,51 @@ def filter_by_depth_range(df, min_depth=None, max_depth=None):
             If None, no minimum filter is applied.
         max_depth (float, optional): Maximum depth to include.
             If None, no maximum filter is applied.
+        use_index (bool): If True, answer the query from the cached
+            per-hole DepthIndex (see depth_index.get_depth_index) instead of
+            scanning every row. Worth it when stepping through many depth
+            windows on the same frame.
 
     Returns:
-        pandas.DataFrame: Filtered DataFrame containing samples within
-            the specified depth range.
+        pandas.DataFrame: Filtered DataFrame containing samples whose whole
+            interval (from_depth to to_depth) lies within the specified
+            depth range.
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> shallow = filter_by_depth_range(df, max_depth=100)
         >>> deep = filter_by_depth_range(df, min_depth=300)
     """
-    # TODO: Implement this function
-    # Hint: Apply conditional filtering based on from_depth and to_depth
-    pass
+    if use_index:
+        return df.iloc[get_depth_index(df).within(min_depth, max_depth)]
+
+    return df[depth_range_mask(df, min_depth, max_depth)]
+
+
+def depth_range_mask(df, min_depth=None, max_depth=None, use_index=False):
+    """
+    Boolean mask of the rows filter_by_depth_range would keep.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        min_depth (float, optional): Minimum depth to include.
+        max_depth (float, optional): Maximum depth to include.
+        use_index (bool): If True, answer the query from the cached DepthIndex.
+
+    Returns:
+        numpy.ndarray: Boolean array with one entry per row of df.
+    """
+    if use_index:
+        mask = np.zeros(len(df), dtype=bool)
+        mask[get_depth_index(df).within(min_depth, max_depth)] = True
+        return mask
+
+    mask = np.ones(len(df), dtype=bool)
+    if min_depth is not None:
+        mask &= (df['from_depth'] >= min_depth).to_numpy(dtype=bool, na_value=False)
+    if max_depth is not None:
+        mask &= (df['to_depth'] <= max_depth).to_numpy(dtype=bool, na_value=False)
+    return mask
 
 
 def calculate_sample_interval(df):
@@ -202,29 +783,132 @@ def calculate_sample_interval(df):
     pass
 
 
-def merge_adjacent_samples(df, element, max_gap=0.5):
+def _weighted_composites(df, elements, order, group, weights, from_depth, to_depth):
     """
-    Identify adjacent samples that could be composited.
+    Aggregate sample pieces into length-weighted composites.
 
-    This function identifies samples that are adjacent (no gap between
-    to_depth of one and from_depth of next) within the same drill hole.
-    These could potentially be composited for grade calculations.
+    Args:
+        df (pandas.DataFrame): Source DataFrame.
+        elements (list): Element columns to composite.
+        order (numpy.ndarray): Source row position of each piece.
+        group (numpy.ndarray): Composite number of each piece; non-decreasing.
+        weights (numpy.ndarray): Length of each piece.
+        from_depth (numpy.ndarray): Start depth of each piece.
+        to_depth (numpy.ndarray): End depth of each piece.
+
+    Returns:
+        pandas.DataFrame: One row per composite.
+    """
+    columns = ['hole_id', 'from_depth', 'to_depth', 'length', 'n_samples'] + elements
+    if len(order) == 0:
+        return pd.DataFrame(columns=columns)
+
+    starts = np.flatnonzero(np.r_[True, group[1:] != group[:-1]])
+    values = df[elements].to_numpy(dtype='float64', na_value=np.nan)[order]
+    valid = ~np.isnan(values)
+    weighted = np.where(valid, values, 0.0) * weights[:, None]
+    valid_length = valid * weights[:, None]
+
+    grade_sum = np.add.reduceat(weighted, starts, axis=0)
+    length_sum = np.add.reduceat(valid_length, starts, axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        grades = np.where(length_sum > 0, grade_sum / length_sum, np.nan)
+
+    result = pd.DataFrame({
+        'hole_id': df['hole_id'].iloc[order[starts]].to_numpy(),
+        'from_depth': np.minimum.reduceat(from_depth, starts),
+        'to_depth': np.maximum.reduceat(to_depth, starts),
+        'length': np.add.reduceat(weights, starts),
+        'n_samples': np.diff(np.r_[starts, len(order)]),
+    })
+    for i, element in enumerate(elements):
+        result[element] = grades[:, i]
+    return result
+
+
+# Fraction of composite_length within which a depth counts as on a bin edge.
+BIN_EDGE_TOLERANCE = 1e-9
+
+
+def merge_adjacent_samples(df, element, max_gap=0.5, composite_length=None):
+    """
+    Composite adjacent samples into length-weighted intervals.
+
+    Samples are sorted by hole_id and from_depth once. In run-merging mode
+    (the default) consecutive samples in the same hole are merged while the
+    gap between the to_depth of one and the from_depth of the next is at
+    most max_gap. In fixed-length mode each hole is cut into intervals of
+    composite_length metres starting at its first sample, and samples that
+    straddle a boundary are split between the two composites.
+
+    Grades are weighted by sample length; samples with a missing value for
+    an element do not contribute to that element's grade. All elements are
+    composited together with vectorized reductions (no per-row or per-hole
+    Python loops).
 
     Args:
         df (pandas.DataFrame): DataFrame containing assay data.
-        element (str): Element column for composite calculation.
+        element (str or list): Element column(s) for composite calculation.
         max_gap (float): Maximum gap between samples to consider adjacent.
+            Ignored when composite_length is given.
+        composite_length (float, optional): Fixed composite length in
+            metres (e.g. 2.0). If None, adjacent runs are merged instead.
 
     Returns:
-        pandas.DataFrame: DataFrame with composite information added.
+        pandas.DataFrame: One row per composite with columns hole_id,
+            from_depth, to_depth, length (sampled metres), n_samples and
+            one length-weighted grade column per element.
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> composites = merge_adjacent_samples(df, 'Au_ppm')
+        >>> two_metre = merge_adjacent_samples(df, ['Au_ppm', 'Cu_pct'],
+        ...                                    composite_length=2.0)
     """
-    # TODO: Implement this function (optional/advanced)
-    # This is an advanced function - implement if you have time
-    pass
+    elements = [element] if isinstance(element, str) else list(element)
+    order, codes, from_depth, to_depth = sort_by_hole_depth(df)
+
+    if composite_length is None:
+        new_hole = np.r_[True, codes[1:] != codes[:-1]]
+        gap = np.r_[0.0, from_depth[1:] - to_depth[:-1]]
+        group = np.cumsum(new_hole | (gap > max_gap))
+        return _weighted_composites(df, elements, order, group,
+                                    to_depth - from_depth, from_depth, to_depth)
+
+    if composite_length <= 0:
+        raise ValueError("composite_length must be positive")
+
+    # Composite grid origin: the first sample depth of each hole
+    new_hole = np.r_[True, codes[1:] != codes[:-1]]
+    hole_start = np.maximum.accumulate(np.where(new_hole, np.arange(len(codes)), 0))
+    origin = from_depth[hole_start]
+
+    # Snap depths within BIN_EDGE_TOLERANCE of a bin edge onto it, so that
+    # rounding (e.g. 0.3 / 0.1) cannot create empty or sliver pieces
+    first_bin = np.floor((from_depth - origin) / composite_length
+                         + BIN_EDGE_TOLERANCE).astype(np.int64)
+    last_bin = np.ceil((to_depth - origin) / composite_length
+                       - BIN_EDGE_TOLERANCE).astype(np.int64) - 1
+    pieces = np.maximum(last_bin - first_bin + 1, 1)
+
+    # Split each sample into one piece per composite it overlaps
+    sample = np.repeat(np.arange(len(order)), pieces)
+    offset = np.arange(len(sample)) - np.repeat(np.cumsum(pieces) - pieces, pieces)
+    bin_index = first_bin[sample] + offset
+    bin_top = origin[sample] + bin_index * composite_length
+    piece_from = np.maximum(from_depth[sample], bin_top)
+    piece_to = np.minimum(to_depth[sample], bin_top + composite_length)
+
+    # Pieces are already ordered by hole; sort by bin within each hole
+    piece_order = np.lexsort((bin_index, codes[sample]))
+    sample, bin_index, bin_top = sample[piece_order], bin_index[piece_order], bin_top[piece_order]
+    piece_from, piece_to = piece_from[piece_order], piece_to[piece_order]
+    hole = codes[sample]
+    group = np.cumsum(np.r_[True, (hole[1:] != hole[:-1]) | (bin_index[1:] != bin_index[:-1])])
+
+    return _weighted_composites(df, elements, order[sample], group,
+                                np.maximum(piece_to - piece_from, 0.0),
+                                bin_top, bin_top + composite_length)
 
 
 def export_clean_data(df, filename, format='csv'):
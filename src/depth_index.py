@@ -0,0 +1,239 @@
+"""
+GGY3601 Coding Assignment 2: Depth Index Module
+
+This module provides a per-hole index over sample intervals so repeated
+depth-range queries do not rescan the whole DataFrame.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import pandas as pd
+import numpy as np
+
+from frame_cache import FrameCache, same_storage
+
+
+INDEX_COLUMNS = ('hole_id', 'from_depth', 'to_depth')
+
+
+def sort_by_hole_depth(df):
+    """
+    Sort interval rows by hole and depth in one vectorized pass.
+
+    Rows with a missing hole_id or depth are left out. The rows are sorted
+    by one float key that puts each hole in its own depth band, which is
+    several times faster than a three-key lexsort; only the few rows whose
+    key ties with a neighbour (repeated from_depth) are then ordered by
+    to_depth with a lexsort. The result is the same as
+    np.lexsort((to_depth, from_depth, codes)).
+
+    Args:
+        df (pandas.DataFrame): DataFrame with hole_id, from_depth and to_depth.
+
+    Returns:
+        tuple: (order, codes, from_depth, to_depth) where order holds the
+            row positions in sorted order and the other arrays are aligned
+            with it. codes are integer hole codes that increase with hole_id.
+    """
+    codes, _ = pd.factorize(df['hole_id'], sort=True)
+    from_depth = df['from_depth'].to_numpy(dtype='float64', na_value=np.nan)
+    to_depth = df['to_depth'].to_numpy(dtype='float64', na_value=np.nan)
+    valid = (codes >= 0) & ~np.isnan(from_depth) & ~np.isnan(to_depth)
+    positions = np.flatnonzero(valid)
+    if len(positions) == 0:
+        return positions, codes[positions], from_depth[positions], to_depth[positions]
+
+    # Rounding in the key can only create ties, never swap two rows
+    low = from_depth[positions].min()
+    span = from_depth[positions].max() - low + 1.0
+    key = codes[positions] * span + (from_depth[positions] - low)
+    order = np.argsort(key)
+    key = key[order]
+    tied = np.r_[key[1:] == key[:-1], False]
+    tied[1:] |= tied[:-1]
+    ties = np.flatnonzero(tied)
+    if len(ties):
+        rows = order[ties]
+        # Break ties as lexsort does: from_depth, to_depth, then position
+        order[ties] = rows[np.lexsort((rows, to_depth[positions[rows]],
+                                       from_depth[positions[rows]], key[ties]))]
+    order = positions[order]
+    return order, codes[order], from_depth[order], to_depth[order]
+
+
+class DepthIndex:
+    """
+    Per-hole index of sample intervals for fast depth-range queries.
+
+    Intervals are sorted once by (hole_id, from_depth). A query for a depth
+    window uses binary search (searchsorted) on the sorted from_depth values
+    of each hole; the longest interval in the hole bounds how far back an
+    overlapping interval can start, so only candidates near the window are
+    checked. Queries return row positions into the original DataFrame, which
+    can be used with df.iloc or to slice NumPy columns without copying the
+    rest of the frame.
+
+    Use get_depth_index() to get a cached index that is rebuilt when the
+    DataFrame changes.
+
+    Args:
+        df (pandas.DataFrame): DataFrame with hole_id, from_depth and to_depth.
+
+    Example:
+        >>> index = get_depth_index(df)
+        >>> rows = index.overlapping(100, 150, hole_id='DH-03')
+        >>> window = df.iloc[rows]
+    """
+
+    def __init__(self, df):
+        # Keep the indexed columns: under pandas Copy-on-Write this makes any
+        # later write to the frame allocate new storage, which is_current sees.
+        self._columns = {column: df[column] for column in INDEX_COLUMNS}
+        self.n_rows = len(df)
+
+        order, codes, from_depth, to_depth = sort_by_hole_depth(df)
+        _, self.hole_ids = pd.factorize(df['hole_id'], sort=True)
+        self._hole_codes = {hole_id: code for code, hole_id in enumerate(self.hole_ids)}
+        self.positions = order
+        self.from_depth = from_depth
+        self.to_depth = to_depth
+
+        n_holes = len(self.hole_ids)
+        counts = np.bincount(codes, minlength=n_holes)
+        self.stops = np.cumsum(counts)
+        self.starts = self.stops - counts
+        lengths = np.maximum(to_depth - from_depth, 0.0)
+        self.max_length = np.zeros(n_holes)
+        np.maximum.at(self.max_length, codes, lengths)
+
+        # Globally sorted search key: each hole gets its own band of width
+        # span, so one searchsorted call can answer a query for every hole.
+        self._base = from_depth.min() - 1.0 if len(from_depth) else 0.0
+        self._top = from_depth.max() + 1.0 if len(from_depth) else 0.0
+        self._span = self._top - self._base + 1.0
+        self._key = codes * self._span + (from_depth - self._base)
+
+    def is_current(self, df):
+        """
+        Check whether the index still describes a DataFrame.
+
+        Returns False after rows are added or removed, or after any of the
+        indexed columns is replaced or written to (with pandas Copy-on-Write,
+        the default from pandas 3.0). Without Copy-on-Write, in-place writes
+        into the existing column arrays cannot be detected.
+
+        Args:
+            df (pandas.DataFrame): DataFrame to check.
+
+        Returns:
+            bool: True if the index can be used for df.
+        """
+        if len(df) != self.n_rows:
+            return False
+        try:
+            return all(same_storage(held, df[column])
+                       for column, held in self._columns.items())
+        except KeyError:
+            return False
+
+    def _search(self, bound, holes, side):
+        """searchsorted for a depth bound within each of the given holes."""
+        bound = np.clip(bound, self._base, self._top)
+        return np.searchsorted(self._key, holes * self._span + (bound - self._base),
+                               side=side)
+
+    def _holes(self, hole_id):
+        """Return hole codes to search: one hole, several, or all."""
+        if hole_id is None:
+            return np.arange(len(self.hole_ids))
+        if isinstance(hole_id, (list, tuple, np.ndarray, pd.Index)):
+            return np.array([self._hole_codes[h] for h in hole_id if h in self._hole_codes],
+                            dtype=np.int64)
+        if hole_id not in self._hole_codes:
+            return np.empty(0, dtype=np.int64)
+        return np.array([self._hole_codes[hole_id]])
+
+    def _collect(self, lo, hi, keep):
+        """Gather candidate ranges, apply the filter and return row positions."""
+        counts = np.maximum(hi - lo, 0)
+        candidates = np.repeat(lo - np.cumsum(counts) + counts, counts) + \
+            np.arange(counts.sum())
+        candidates = candidates[keep(candidates)]
+        return np.sort(self.positions[candidates])
+
+    def overlapping(self, top=None, bottom=None, hole_id=None):
+        """
+        Find intervals that overlap the depth window (top, bottom).
+
+        An interval overlaps when from_depth < bottom and to_depth > top.
+
+        Args:
+            top (float, optional): Upper (shallow) end of the window. None
+                means no limit.
+            bottom (float, optional): Lower (deep) end of the window. None
+                means no limit.
+            hole_id (str or list, optional): Restrict to one or more holes.
+
+        Returns:
+            numpy.ndarray: Sorted row positions into the indexed DataFrame.
+        """
+        top = -np.inf if top is None else top
+        bottom = np.inf if bottom is None else bottom
+        holes = self._holes(hole_id)
+        lo = self._search(top - self.max_length[holes], holes, 'left')
+        hi = self._search(bottom, holes, 'left')
+        # Candidates are clipped to the window by from_depth; check to_depth
+        return self._collect(lo, hi, lambda c: (self.to_depth[c] > top)
+                             & (self.from_depth[c] < bottom))
+
+    def within(self, top=None, bottom=None, hole_id=None):
+        """
+        Find intervals contained in the depth window [top, bottom].
+
+        An interval is contained when from_depth >= top and to_depth <= bottom.
+
+        Args:
+            top (float, optional): Minimum depth. None means no limit.
+            bottom (float, optional): Maximum depth. None means no limit.
+            hole_id (str or list, optional): Restrict to one or more holes.
+
+        Returns:
+            numpy.ndarray: Sorted row positions into the indexed DataFrame.
+        """
+        top = -np.inf if top is None else top
+        bottom = np.inf if bottom is None else bottom
+        holes = self._holes(hole_id)
+        lo = self._search(top, holes, 'left')
+        hi = self._search(bottom, holes, 'right')
+        return self._collect(lo, hi, lambda c: (self.to_depth[c] <= bottom)
+                             & (self.from_depth[c] >= top))
+
+
+_index_cache = FrameCache()
+
+
+def get_depth_index(df):
+    """
+    Return the depth index for a DataFrame, building it if needed.
+
+    The index is cached per DataFrame object and rebuilt automatically when
+    DepthIndex.is_current reports that the frame has changed. Entries are
+    dropped when the DataFrame is garbage collected.
+
+    Args:
+        df (pandas.DataFrame): DataFrame with hole_id, from_depth and to_depth.
+
+    Returns:
+        DepthIndex: Index for df.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> for top in range(0, 400, 10):
+        ...     rows = get_depth_index(df).overlapping(top, top + 10)
+    """
+    index = _index_cache.get(df)
+    if index is not None and index.is_current(df):
+        return index
+    return _index_cache.set(df, DepthIndex(df))
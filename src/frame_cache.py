@@ -0,0 +1,74 @@
+"""
+GGY3601 Coding Assignment 2: Frame Cache Module
+
+This module keeps values cached per DataFrame object, such as depth and
+group indexes, and checks whether a cached column is still current.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import weakref
+
+import numpy as np
+
+
+def same_storage(held, current):
+    """Check whether two Series still share the same underlying storage."""
+    if len(held) != len(current):
+        return False
+    if isinstance(current.dtype, np.dtype):
+        held_values = np.asarray(held)
+        current_values = np.asarray(current)
+        return (held_values.__array_interface__['data'][0]
+                == current_values.__array_interface__['data'][0])
+    return held.array is current.array
+
+
+class FrameCache:
+    """
+    Values cached per DataFrame object.
+
+    Entries are keyed by the frame's id() plus an optional key, hold only a
+    weak reference to the frame, and are dropped when the frame is garbage
+    collected. A lookup never returns the entry of an earlier frame that
+    happened to have the same id().
+
+    Example:
+        >>> _cache = FrameCache()
+        >>> index = _cache.get(df)
+        >>> if index is None:
+        ...     index = _cache.set(df, DepthIndex(df))
+    """
+
+    def __init__(self):
+        # (id(df), key) -> (weak reference to df, value)
+        self._entries = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, df, key=None):
+        """Return the value cached for df and key, or None."""
+        entry = self._entries.get((id(df), key))
+        if entry is None or entry[0]() is not df:
+            return None
+        return entry[1]
+
+    def set(self, df, value, key=None):
+        """Cache a value for df and key, and return it."""
+        cache_key = (id(df), key)
+        ref = weakref.ref(df, lambda ref: self._forget(ref, cache_key))
+        self._entries[cache_key] = (ref, value)
+        return value
+
+    def discard(self, df, key=None):
+        """Drop the value cached for df and key, if any."""
+        self._entries.pop((id(df), key), None)
+
+    def _forget(self, ref, cache_key):
+        """Drop an entry once its DataFrame has been garbage collected."""
+        entry = self._entries.get(cache_key)
+        if entry is not None and entry[0] is ref:
+            del self._entries[cache_key]
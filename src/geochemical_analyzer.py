@@ -8,19 +8,205 @@ Student ID: [YOUR ID]
 Date: [DATE]
 """
 
+import os
+import warnings
+
 import pandas as pd
 import numpy as np
 
+from assay_cache import load_cached_assay_data
+from assay_schema import (
+    ASSAY_COLUMNS,
+    coerce_assay_columns,
+    concat_assay_chunks,
+    csv_read_options,
+)
+from grouped_stats import grouped_statistics
+from streaming_stats import (
+    CoMomentAccumulator,
+    MomentAccumulator,
+    QuantileSketch,
+    iter_frames,
+    reiterable,
+)
+
+
+# Quantiles reported as '25%', '50%' and '75%' by calculate_element_statistics.
+QUARTILES = [0.25, 0.5, 0.75]
+
+# Scales the median absolute deviation to match the standard deviation of
+# normally distributed data, so 'mad' multipliers are comparable to 'std'.
+MAD_SCALE = 1.4826
+
+ANOMALY_METHODS = ('std', 'mad', 'log', 'percentile')
+
+# Rows parsed at a time when load_assay_data filters rows while loading.
+LOAD_CHUNKSIZE = 100_000
+
+
+class AssayChunkReader:
+    """
+    Re-iterable stream of typed assay DataFrame chunks.
+
+    Each iteration re-opens the CSV file and yields DataFrames of at most
+    ``chunksize`` rows, so only one chunk is held in memory at a time.
+    Because the reader can be iterated more than once, functions that need
+    two passes over the data (e.g. anomaly detection) can stream it twice
+    instead of materializing it.
+
+    Args:
+        filename (str): Path to the CSV file containing assay data.
+        chunksize (int): Number of rows per chunk.
+        float32 (bool): If True, parse element columns as float32.
+        columns (list, optional): Columns to yield. Other columns are not
+            parsed, except those the predicate needs.
+        where (dict, optional): Row predicate applied to each chunk as it is
+            parsed (see row_predicate_mask).
+
+    Example:
+        >>> chunks = load_assay_data('data/geochemical_assays.csv', chunksize=100000)
+        >>> for chunk in chunks:
+        ...     print(len(chunk))
+    """
+
+    def __init__(self, filename, chunksize, float32=False, columns=None, where=None):
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        self.filename = filename
+        self.chunksize = chunksize
+        self.float32 = float32
+        self.columns = None if columns is None else list(columns)
+        self.where = where or None
+
+    def _read_options(self):
+        """read_csv options for the requested columns plus the predicate's."""
+        return csv_read_options(_parse_columns(self.columns, self.where))
+
+    def empty(self):
+        """Return a frame with no rows and the columns this reader yields."""
+        df = coerce_assay_columns(pd.read_csv(self.filename, nrows=0, **self._read_options()),
+                                  self.float32)
+        return df if self.columns is None else df[self.columns]
+
+    def __iter__(self):
+        with pd.read_csv(self.filename, chunksize=self.chunksize,
+                         **self._read_options()) as reader:
+            for chunk in reader:
+                chunk = coerce_assay_columns(chunk, self.float32)
+                if self.where is not None:
+                    chunk = chunk[row_predicate_mask(chunk, self.where)]
+                if self.columns is not None:
+                    chunk = chunk[self.columns]
+                yield chunk
+
+
+def _parse_columns(columns, where):
+    """Columns to parse: the requested ones plus those the predicate reads."""
+    if columns is None:
+        return None
+    return list(columns) + [column for column in (where or {}) if column not in columns]
+
+
+def _check_columns(filename, columns, where):
+    """Raise ValueError if columns or where name columns the file lacks."""
+    header = pd.read_csv(filename, nrows=0).columns
+    unknown = [column for column in list(columns or []) + list(where or {})
+               if column not in header]
+    if unknown:
+        raise ValueError(f"Unknown columns in {filename}: {unknown}")
+
+
+def row_predicate_mask(df, where):
+    """
+    Boolean mask of the rows matching a simple predicate.
+
+    The predicate is a dict with one condition per column, all of which
+    must hold:
+
+    - a scalar keeps rows equal to it, e.g. ``{'sample_quality': 'Good'}``
+    - a list or set keeps rows whose value is in it
+    - a (low, high) tuple keeps rows with low <= value <= high; either end
+      may be None
+
+    Missing values never match.
 
-def load_assay_data(filename):
+    Args:
+        df (pandas.DataFrame): DataFrame to test.
+        where (dict): Column conditions.
+
+    Returns:
+        numpy.ndarray: Boolean array with one entry per row of df.
+
+    Example:
+        >>> where = {'sample_quality': 'Good', 'to_depth': (None, 200)}
+        >>> shallow_good = df[row_predicate_mask(df, where)]
+    """
+    mask = np.ones(len(df), dtype=bool)
+    for column, condition in where.items():
+        values = df[column]
+        if isinstance(condition, tuple):
+            low, high = condition
+            if low is not None:
+                mask &= (values >= low).to_numpy(dtype=bool, na_value=False)
+            if high is not None:
+                mask &= (values <= high).to_numpy(dtype=bool, na_value=False)
+        elif isinstance(condition, (list, set, frozenset)):
+            mask &= values.isin(condition).to_numpy(dtype=bool, na_value=False)
+        else:
+            mask &= (values == condition).to_numpy(dtype=bool, na_value=False)
+    return mask
+
+
+def _element_values(df, element):
+    """Return an element column as a float64 NumPy array with NaN for missing."""
+    return df[element].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _element_block(df, elements):
+    """Return element columns as a 2-D float64 array (rows x elements)."""
+    return df[list(elements)].to_numpy(dtype='float64', na_value=np.nan)
+
+
+def _accumulate(data, elements):
+    """Stream data into a MomentAccumulator for the given elements."""
+    acc = MomentAccumulator(elements)
+    for chunk in iter_frames(data):
+        acc.update(_element_block(chunk, acc.elements))
+    return acc
+
+
+def load_assay_data(filename, chunksize=None, float32=False, cache=False,
+                    columns=None, where=None):
     """
     Load geochemical assay data from a CSV file.
 
     This function reads assay data from a CSV file and returns it as a pandas
     DataFrame. It handles the case where the file doesn't exist gracefully.
 
+    Columns are parsed with the compact schema from assay_schema: hole_id,
+    lithology and sample_quality become categoricals, depths are float64 and
+    assay_date is parsed to datetime64 once at load time. For files
+    larger than available memory, pass ``chunksize`` to get a streaming
+    reader instead of a single DataFrame; calculate_element_statistics,
+    detect_anomalies and generate_summary_report all accept it directly.
+
     Args:
         filename (str): Path to the CSV file containing assay data.
+        chunksize (int, optional): If given, return an AssayChunkReader that
+            yields DataFrames of at most this many rows instead of loading
+            the whole file.
+        float32 (bool): If True, store element concentrations as float32
+            to halve their memory footprint.
+        cache (bool): If True, read through a Parquet sidecar cache that is
+            rebuilt whenever the CSV changes (see assay_cache). Ignored when
+            ``chunksize`` is given.
+        columns (list, optional): Only load these columns, in this order.
+            The others are never parsed (or, with ``cache``, never read from the cache).
+        where (dict, optional): Only keep rows matching this predicate, e.g.
+            ``{'sample_quality': 'Good', 'to_depth': (None, 200)}`` (see
+            row_predicate_mask). The CSV is then parsed in chunks and
+            rejected rows are dropped chunk by chunk. Kept rows retain their
+            row number in the file as index.
 
     Returns:
         pandas.DataFrame: DataFrame containing the assay data with columns:
@@ -37,15 +223,50 @@ def load_assay_data(filename):
             - sample_quality: QA/QC classification
             - assay_date: Date of analysis
 
+        AssayChunkReader: If ``chunksize`` is given.
+
         None: If the file doesn't exist or cannot be read.
 
+    Raises:
+        ValueError: If ``columns`` or ``where`` name a column that is not
+            in the file.
+
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> print(df.head())
+        >>> chunks = load_assay_data('data/geochemical_assays.csv', chunksize=50000)
+        >>> report = generate_summary_report(chunks, ['Au_ppm', 'Cu_pct'])
+        >>> good = load_assay_data('data/geochemical_assays.csv',
+        ...                        columns=['hole_id', 'Au_ppm'],
+        ...                        where={'sample_quality': 'Good'})
     """
-    # TODO: Implement this function
-    # Hint: Use pd.read_csv() and handle FileNotFoundError
-    pass
+    if not os.path.isfile(filename):
+        return None
+    if columns is not None or where:
+        _check_columns(filename, columns, where)
+
+    if chunksize is not None:
+        return AssayChunkReader(filename, chunksize, float32=float32,
+                                columns=columns, where=where)
+
+    try:
+        if cache:
+            df = load_cached_assay_data(filename, columns=_parse_columns(columns, where),
+                                        float32=float32)
+            if where:
+                df = df[row_predicate_mask(df, where)]
+            return df if columns is None else df[columns]
+        if where:
+            reader = AssayChunkReader(filename, LOAD_CHUNKSIZE, float32=float32,
+                                      columns=columns, where=where)
+            frames = list(reader)
+            return concat_assay_chunks(frames) if frames else reader.empty()
+        df = coerce_assay_columns(pd.read_csv(filename, **csv_read_options(columns)),
+                                  float32)
+        # usecols keeps file order; return the columns in the order asked for
+        return df if columns is None else df[columns]
+    except (OSError, ValueError, pd.errors.ParserError):
+        return None
 
 
 def filter_by_quality(df, quality_level):
@@ -70,12 +291,29 @@ def filter_by_quality(df, quality_level):
         >>> good_samples = filter_by_quality(df, 'Good')
         >>> print(f"Found {len(good_samples)} good quality samples")
     """
-    # TODO: Implement this function
-    # Hint: Use boolean indexing with df[df['column'] == value]
-    pass
+    return df[quality_mask(df, quality_level)]
+
+
+def quality_mask(df, quality_level):
+    """
+    Boolean mask of the rows with a given sample quality.
+
+    Mask version of filter_by_quality: nothing is copied, so masks from
+    several filters can be combined before rows are selected once.
+
+    Args:
+        df (pandas.DataFrame): DataFrame with a 'sample_quality' column.
+        quality_level (str): Quality level to keep.
+
+    Returns:
+        numpy.ndarray: Boolean array with one entry per row of df.
+    """
+    # On categorical columns the comparison is done on the integer codes,
+    # not on the strings.
+    return (df['sample_quality'] == quality_level).to_numpy(dtype=bool, na_value=False)
 
 
-def calculate_element_statistics(df, element):
+def calculate_element_statistics(df, element, quantiles='auto'):
     """
     Calculate descriptive statistics for a specific element.
 
@@ -83,9 +321,18 @@ def calculate_element_statistics(df, element):
     including count, mean, standard deviation, minimum, quartiles, and maximum.
 
     Args:
-        df (pandas.DataFrame): DataFrame containing assay data.
+        df (pandas.DataFrame or iterable of pandas.DataFrame): Assay data, or
+            a chunk stream such as the one returned by
+            ``load_assay_data(filename, chunksize=...)``. For chunked input,
+            count/mean/std/min/max are merged chunk by chunk.
         element (str): Column name for the element to analyze.
             Examples: 'Au_ppm', 'Cu_pct', 'Ag_ppm', 'Fe_pct', 'S_pct'
+        quantiles (str): How the quartiles are computed:
+            - 'auto': exact for a DataFrame, sketch for chunked input
+            - 'exact': full sort of the column (chunked input keeps the
+              element column in memory)
+            - 'sketch': bounded-memory QuantileSketch; see its docstring
+              for the error bound
 
     Returns:
         dict: Dictionary containing the following keys:
@@ -104,12 +351,41 @@ def calculate_element_statistics(df, element):
         >>> print(f"Mean Au: {au_stats['mean']:.3f} ppm")
         >>> print(f"Max Au: {au_stats['max']:.3f} ppm")
     """
-    # TODO: Implement this function
-    # Hint: Use df[element].describe() and convert to dictionary
-    pass
-
-
-def detect_anomalies(df, element, threshold_multiplier):
+    if quantiles not in ('auto', 'exact', 'sketch'):
+        raise ValueError(f"Unknown quantiles mode: {quantiles}")
+
+    if isinstance(df, pd.DataFrame) and quantiles != 'sketch':
+        stats = df[element].astype('float64').describe().to_dict()
+        stats['count'] = int(stats['count'])
+        return stats
+
+    use_sketch = quantiles != 'exact'
+    acc = MomentAccumulator(element)
+    sketch = QuantileSketch()
+    columns = []
+    for chunk in iter_frames(df):
+        values = _element_values(chunk, element)
+        acc.update(values)
+        if use_sketch:
+            sketch.update(values)
+        else:
+            columns.append(values[~np.isnan(values)])
+
+    stats = acc.statistics()[element]
+    if use_sketch:
+        q1, q2, q3 = sketch.quantile(QUARTILES)
+    else:
+        values = np.concatenate(columns) if columns else np.empty(0)
+        if values.size:
+            q1, q2, q3 = np.quantile(values, QUARTILES)
+        else:
+            q1 = q2 = q3 = np.nan
+    return {'count': stats['count'], 'mean': stats['mean'], 'std': stats['std'],
+            'min': stats['min'], '25%': float(q1), '50%': float(q2),
+            '75%': float(q3), 'max': stats['max']}
+
+
+def detect_anomalies(df, element, threshold_multiplier, method='std'):
     """
     Detect geochemical anomalies using statistical threshold.
 
@@ -118,11 +394,17 @@ def detect_anomalies(df, element, threshold_multiplier):
     These samples represent potential mineralization targets.
 
     Args:
-        df (pandas.DataFrame): DataFrame containing assay data.
+        df (pandas.DataFrame or iterable of pandas.DataFrame): Assay data, or
+            a chunk stream. Chunked input is read twice (once for the
+            threshold, once to collect anomalous rows), so pass a re-iterable
+            source such as an AssayChunkReader; one-shot iterators are
+            buffered in memory.
         element (str): Column name for the element to analyze.
         threshold_multiplier (float): Number of standard deviations above
             the mean to use as the anomaly threshold. Common values are
             2.0 (95th percentile) or 2.5 (99th percentile).
+        method (str): Threshold mode (see anomaly_thresholds). Chunked
+            input supports only the default 'std'.
 
     Returns:
         pandas.DataFrame: DataFrame containing only samples where the
@@ -134,12 +416,172 @@ def detect_anomalies(df, element, threshold_multiplier):
         >>> print(f"Found {len(anomalies)} anomalous samples")
         >>> print(anomalies[['sample_id', 'Au_ppm', 'lithology']])
     """
-    # TODO: Implement this function
-    # Hint:
-    # 1. Calculate mean and std (excluding NaN values)
-    # 2. Calculate threshold = mean + (threshold_multiplier * std)
-    # 3. Filter df where element > threshold
-    pass
+    if isinstance(df, pd.DataFrame):
+        if method != 'std':
+            mask = anomaly_masks(df, [element], [threshold_multiplier], method)
+            return df[mask[:, 0, 0]]
+        mean_val = df[element].mean()
+        std_val = df[element].std()
+        threshold = mean_val + threshold_multiplier * std_val
+        return df[df[element] > threshold]
+
+    if method != 'std':
+        raise ValueError("Chunked input only supports method='std'")
+    df = reiterable(df)
+    stats = _accumulate(df, [element]).statistics()[element]
+    threshold = stats['mean'] + threshold_multiplier * stats['std']
+
+    anomalies = []
+    for chunk in iter_frames(df):
+        if not anomalies:
+            # Keep an empty slice so the result has the right columns
+            anomalies.append(chunk.iloc[:0])
+        anomalies.append(chunk[_element_values(chunk, element) > threshold])
+    if not anomalies:
+        return pd.DataFrame(columns=ASSAY_COLUMNS)
+    return pd.concat(anomalies, ignore_index=True)
+
+
+def anomaly_thresholds(df, elements, multipliers, method='std'):
+    """
+    Calculate anomaly thresholds for many elements and multipliers at once.
+
+    Each element column is reduced once; every multiplier then only costs
+    an element-wise multiply-add.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        elements (list): List of element column names.
+        multipliers (float or list): Threshold multipliers. Their meaning
+            depends on method.
+        method (str): Threshold mode:
+            - 'std': mean + k * std (as detect_anomalies)
+            - 'mad': median + k * MAD, with the MAD scaled by 1.4826 so k
+              is comparable to a number of standard deviations; robust to
+              the heavy upper tail of gold grades
+            - 'log': mean + k * std of log10 values, returned in original
+              units; values <= 0 are ignored
+            - 'percentile': k is a percentile between 0 and 100, e.g. 97.5
+
+    Returns:
+        pandas.DataFrame: Thresholds with one row per element and one
+            column per multiplier.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> print(anomaly_thresholds(df, ['Au_ppm', 'Ag_ppm'], [2.0, 2.5, 3.0], 'mad'))
+    """
+    elements = list(elements)
+    multipliers = np.atleast_1d(np.asarray(multipliers, dtype='float64'))
+    block = _element_block(df, elements)
+
+    # All-NaN columns give NaN thresholds; silence numpy's warnings for them
+    with warnings.catch_warnings(), np.errstate(invalid='ignore', divide='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        if method == 'std':
+            centre = np.nanmean(block, axis=0)
+            spread = np.nanstd(block, axis=0, ddof=1)
+        elif method == 'mad':
+            centre = np.nanmedian(block, axis=0)
+            spread = MAD_SCALE * np.nanmedian(np.abs(block - centre), axis=0)
+        elif method == 'log':
+            logs = np.log10(np.where(block > 0, block, np.nan))
+            centre = np.nanmean(logs, axis=0)
+            spread = np.nanstd(logs, axis=0, ddof=1)
+        elif method == 'percentile':
+            thresholds = np.nanpercentile(block, multipliers, axis=0).T
+        else:
+            raise ValueError(f"Unknown anomaly method: {method}")
+
+        if method != 'percentile':
+            thresholds = centre[:, None] + multipliers[None, :] * spread[:, None]
+        if method == 'log':
+            thresholds = 10.0 ** thresholds
+
+    return pd.DataFrame(thresholds.reshape(len(elements), len(multipliers)),
+                        index=elements, columns=multipliers)
+
+
+def anomaly_masks(df, elements, multipliers, method='std'):
+    """
+    Flag anomalous samples for many elements and multipliers in one call.
+
+    Instead of returning copied DataFrames (like detect_anomalies), this
+    returns a boolean mask that can index df or be reduced directly, e.g.
+    ``masks.sum(axis=0)`` gives the anomaly counts per element and
+    multiplier.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        elements (list): List of element column names.
+        multipliers (float or list): Threshold multipliers (see
+            anomaly_thresholds for their meaning per method).
+        method (str): 'std', 'mad', 'log' or 'percentile'.
+
+    Returns:
+        numpy.ndarray: Boolean array of shape (rows, elements, multipliers);
+            True where the value is strictly above the threshold. Missing
+            values are never flagged.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> masks = anomaly_masks(df, ['Au_ppm', 'Cu_pct'], [2.0, 3.0], method='log')
+        >>> au_strong = df[masks[:, 0, 1]]
+    """
+    elements = list(elements)
+    thresholds = anomaly_thresholds(df, elements, multipliers, method).to_numpy()
+    block = _element_block(df, elements)
+    return block[:, :, None] > thresholds[None, :, :]
+
+
+def sweep_anomaly_thresholds(df, element, multipliers, method='std',
+                             id_column='sample_id'):
+    """
+    Evaluate many anomaly threshold multipliers with one sort per element.
+
+    Each element column is sorted once; the anomaly count and the flagged
+    samples for every multiplier then come from a binary search
+    (searchsorted) into the sorted values, giving the whole
+    threshold-versus-count curve from a single call.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        element (str or list): Element column name(s).
+        multipliers (list): Threshold multipliers to evaluate.
+        method (str): Threshold mode, as in anomaly_thresholds.
+        id_column (str): Column holding the sample identifiers to return.
+
+    Returns:
+        pandas.DataFrame: One row per element and multiplier with columns
+            'element', 'multiplier', 'threshold', 'anomaly_count' and
+            'sample_ids' (array of flagged ids, highest values last).
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> curve = sweep_anomaly_thresholds(df, 'Au_ppm', np.arange(1.0, 4.01, 0.25))
+        >>> print(curve[['multiplier', 'anomaly_count']])
+    """
+    elements = [element] if isinstance(element, str) else list(element)
+    multipliers = np.atleast_1d(np.asarray(multipliers, dtype='float64'))
+    thresholds = anomaly_thresholds(df, elements, multipliers, method).to_numpy()
+    ids = df[id_column].to_numpy()
+
+    rows = []
+    for i, name in enumerate(elements):
+        values = _element_values(df, name)
+        valid = np.flatnonzero(~np.isnan(values))
+        order = valid[np.argsort(values[valid], kind='stable')]
+        sorted_values = values[order]
+        sorted_ids = ids[order]
+        # Rows strictly above a threshold start at its right insertion point
+        starts = np.searchsorted(sorted_values, thresholds[i], side='right')
+        starts = np.where(np.isnan(thresholds[i]), len(order), starts)
+        for multiplier, threshold, start in zip(multipliers, thresholds[i], starts):
+            rows.append({'element': name, 'multiplier': multiplier,
+                         'threshold': threshold, 'anomaly_count': len(order) - start,
+                         'sample_ids': sorted_ids[start:]})
+    return pd.DataFrame(rows, columns=['element', 'multiplier', 'threshold',
+                                       'anomaly_count', 'sample_ids'])
 
 
 def correlate_elements(df, element1, element2):
@@ -150,7 +592,9 @@ def correlate_elements(df, element1, element2):
     which can help identify geochemical associations and pathfinder relationships.
 
     Args:
-        df (pandas.DataFrame): DataFrame containing assay data.
+        df (pandas.DataFrame or iterable of pandas.DataFrame): Assay data, or
+            a chunk stream. Chunked input is reduced batch by batch into a
+            CoMomentAccumulator, so only one chunk is in memory at a time.
         element1 (str): Column name for the first element.
         element2 (str): Column name for the second element.
 
@@ -167,9 +611,128 @@ def correlate_elements(df, element1, element2):
         >>> if r > 0.5:
         ...     print("Strong positive correlation - elements may be associated")
     """
-    # TODO: Implement this function
-    # Hint: Use df[element1].corr(df[element2])
-    pass
+    if isinstance(df, pd.DataFrame):
+        return float(df[element1].corr(df[element2]))
+
+    acc = CoMomentAccumulator(element1, element2)
+    for chunk in iter_frames(df):
+        acc.update(_element_block(chunk, acc.elements))
+    return acc.correlation()
+
+
+def _pairwise_pearson(block):
+    """
+    Pairwise-complete Pearson correlations for all columns of a 2-D block.
+
+    For each pair of columns only rows where both are present are used.
+    All pairs are computed together from masked matrix products: with X the
+    data (missing set to 0) and M the presence mask, M.T @ M gives the pair
+    counts, X.T @ M the pair sums, and so on.
+    """
+    valid = ~np.isnan(block)
+    mask = valid.astype('float64')
+    # Centre each column first to limit cancellation in the sums of squares
+    centre = np.nanmean(np.where(valid.any(axis=0), block, 0.0), axis=0)
+    x = np.where(valid, block - centre, 0.0)
+    x2 = x * x
+
+    n = mask.T @ mask
+    sum_x = x.T @ mask
+    sum_y = sum_x.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cov = x.T @ x - sum_x * sum_y / n
+        var_x = x2.T @ mask - sum_x * sum_x / n
+        var_y = var_x.T
+        corr = cov / np.sqrt(var_x * var_y)
+    corr[n < 2] = np.nan
+    return np.clip(corr, -1.0, 1.0)
+
+
+def correlation_matrix(df, elements, method='pearson'):
+    """
+    Calculate the correlation matrix for several elements in one computation.
+
+    Uses pairwise-complete observations, like correlate_elements: for each
+    pair only samples where both elements are present count. All pairs are
+    computed at once with matrix products instead of one pass per pair.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        elements (list): List of element column names.
+        method (str): 'pearson' (default) or 'spearman'. The Spearman
+            variant ranks each column once over all of its non-missing
+            values and then applies the Pearson computation to the ranks.
+            When missing values differ between columns this can differ
+            slightly from pandas, which re-ranks every pair separately.
+
+    Returns:
+        pandas.DataFrame: Symmetric correlation matrix indexed by element.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> corr = correlation_matrix(df, ['Au_ppm', 'Cu_pct', 'Ag_ppm'])
+        >>> print(corr.loc['Au_ppm', 'Cu_pct'])
+    """
+    elements = list(elements)
+    if method == 'pearson':
+        block = _element_block(df, elements)
+    elif method == 'spearman':
+        block = df[elements].astype('float64').rank().to_numpy(dtype='float64',
+                                                                na_value=np.nan)
+    else:
+        raise ValueError(f"Unknown correlation method: {method}")
+    return pd.DataFrame(_pairwise_pearson(block), index=elements, columns=elements)
+
+
+def calculate_multi_element_statistics(df, elements, threshold_multiplier=2.5):
+    """
+    Calculate summary statistics for several elements in a single pass.
+
+    All element columns are extracted once into a 2-D NumPy block and the
+    count, mean, standard deviation, min, max, missing count and anomaly
+    count are computed for every column at once, instead of rescanning the
+    frame per element and per statistic.
+
+    Args:
+        df (pandas.DataFrame or iterable of pandas.DataFrame): Assay data, or
+            a chunk stream. Chunked input is read twice: once for the
+            moments, once to count values above the anomaly threshold.
+        elements (list): List of element column names.
+        threshold_multiplier (float): Number of standard deviations above
+            the mean used for the anomaly threshold (see detect_anomalies).
+
+    Returns:
+        dict: Nested dictionary keyed by element, each value containing
+            'count', 'mean', 'std', 'min', 'max', 'missing' and
+            'anomaly_count'.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> stats = calculate_multi_element_statistics(df, ['Au_ppm', 'Cu_pct'])
+        >>> print(stats['Au_ppm']['anomaly_count'])
+    """
+    elements = list(elements)
+    if isinstance(df, pd.DataFrame):
+        block = _element_block(df, elements)
+        report = MomentAccumulator(elements).update(block).statistics()
+    else:
+        df = reiterable(df)
+        report = _accumulate(df, elements).statistics()
+
+    thresholds = np.array([report[element]['mean']
+                           + threshold_multiplier * report[element]['std']
+                           for element in elements])
+
+    if isinstance(df, pd.DataFrame):
+        anomaly_counts = (block > thresholds).sum(axis=0)
+    else:
+        anomaly_counts = np.zeros(len(elements), dtype=np.int64)
+        for chunk in iter_frames(df):
+            anomaly_counts += (_element_block(chunk, elements) > thresholds).sum(axis=0)
+
+    for i, element in enumerate(elements):
+        report[element]['anomaly_count'] = int(anomaly_counts[i])
+    return report
 
 
 def generate_summary_report(df, elements):
@@ -180,7 +743,8 @@ def generate_summary_report(df, elements):
     including descriptive statistics, missing value counts, and anomaly counts.
 
     Args:
-        df (pandas.DataFrame): DataFrame containing assay data.
+        df (pandas.DataFrame or iterable of pandas.DataFrame): Assay data, or
+            a chunk stream.
         elements (list): List of element column names to include in the report.
             Example: ['Au_ppm', 'Cu_pct', 'Ag_ppm']
 
@@ -195,6 +759,9 @@ def generate_summary_report(df, elements):
             - 'missing': Count of missing (NaN) values
             - 'anomaly_count': Number of samples exceeding 2.5*std threshold
 
+        All elements are computed together in one pass by
+        calculate_multi_element_statistics().
+
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
         >>> elements = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
@@ -202,14 +769,7 @@ def generate_summary_report(df, elements):
         >>> for elem, stats in report.items():
         ...     print(f"{elem}: mean={stats['mean']:.3f}, anomalies={stats['anomaly_count']}")
     """
-    # TODO: Implement this function
-    # Hint:
-    # 1. Loop through each element
-    # 2. Calculate statistics using calculate_element_statistics()
-    # 3. Count missing values with df[element].isna().sum()
-    # 4. Count anomalies using detect_anomalies()
-    # 5. Build and return the nested dictionary
-    pass
+    return calculate_multi_element_statistics(df, elements, 2.5)
 
 
 # Additional analysis functions you may find useful
@@ -230,9 +790,9 @@ def get_element_by_lithology(df, element):
         >>> grouped = get_element_by_lithology(df, 'Au_ppm')
         >>> print(grouped)
     """
-    # TODO: Implement this function (optional)
-    # Hint: Use df.groupby('lithology')[element].describe()
-    pass
+    # Group codes are cached with the frame (see grouped_stats), so calling
+    # this for several elements does not regroup each time.
+    return grouped_statistics(df, 'lithology', [element])[element]
 
 
 def get_element_by_hole(df, element):
@@ -251,9 +811,7 @@ def get_element_by_hole(df, element):
         >>> by_hole = get_element_by_hole(df, 'Au_ppm')
         >>> print(by_hole)
     """
-    # TODO: Implement this function (optional)
-    # Hint: Use df.groupby('hole_id')[element].agg(['mean', 'max', 'count'])
-    pass
+    return grouped_statistics(df, 'hole_id', [element], stats=['mean', 'max', 'count'])[element]
 
 
 def calculate_interval_weighted_mean(df, element):
@@ -268,7 +826,8 @@ def calculate_interval_weighted_mean(df, element):
         element (str): Column name for the element to analyze.
 
     Returns:
-        float: Interval-weighted mean of the element.
+        float: Interval-weighted mean of the element. Samples with a missing
+            element value do not contribute to the weights.
 
     Example:
         >>> df = load_assay_data('data/geochemical_assays.csv')
@@ -276,9 +835,10 @@ def calculate_interval_weighted_mean(df, element):
         >>> simple_mean = df['Au_ppm'].mean()
         >>> print(f"Weighted: {weighted_mean:.3f}, Simple: {simple_mean:.3f}")
     """
-    # TODO: Implement this function (optional)
-    # Hint:
-    # 1. Calculate interval length: df['to_depth'] - df['from_depth']
-    # 2. Calculate weighted sum: (element * interval).sum()
-    # 3. Divide by total interval: interval.sum()
-    pass
+    values = _element_values(df, element)
+    interval = (df['to_depth'] - df['from_depth']).to_numpy(dtype='float64')
+    valid = ~np.isnan(values)
+    total_interval = interval[valid].sum()
+    if total_interval == 0:
+        return np.nan
+    return float((values[valid] * interval[valid]).sum() / total_interval)
@@ -9,6 +9,7 @@ Student ID: [YOUR ID]
 Date: [DATE]
 """
 
+import argparse
 import sys
 from pathlib import Path
 
@@ -21,20 +22,33 @@ from geochemical_analyzer import (
     filter_by_quality,
     calculate_element_statistics,
     detect_anomalies,
-    correlate_elements,
+    correlation_matrix,
     generate_summary_report
 )
 from data_cleaning import (
     handle_missing_values,
     validate_data_quality
 )
+from assay_cache import source_hash
+from step_cache import DEFAULT_STEP_CACHE_DIR, StepCache
 from visualization import (
     plot_element_histogram,
     plot_correlation_matrix
 )
 
 
-def main():
+def parse_args(argv=None):
+    """Parse command line options for the workflow."""
+    parser = argparse.ArgumentParser(description="Geochemical data analysis workflow")
+    parser.add_argument('--rebuild', action='store_true',
+                        help="recompute every step instead of reusing cached results")
+    parser.add_argument('--cache-dir', default=None,
+                        help=f"directory for cached step results "
+                             f"(default: {DEFAULT_STEP_CACHE_DIR} next to the data)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
     """
     Main analysis workflow for geochemical data.
 
@@ -46,7 +60,13 @@ def main():
     4. Anomaly detection
     5. Correlation analysis
     6. Generating summary reports
+
+    Step results are cached on disk (see step_cache), so a re-run only
+    recomputes steps whose data, parameters or code changed. Pass
+    --rebuild to recompute everything.
     """
+    args = parse_args(argv)
+
     print("=" * 60)
     print("GGY3601 Coding Assignment 2: Geochemical Data Analysis")
     print("=" * 60)
@@ -57,7 +77,7 @@ def main():
     print("\n--- Step 1: Loading Data ---")
 
     data_path = Path(__file__).parent.parent / "data" / "geochemical_assays.csv"
-    df = load_assay_data(str(data_path))
+    df = load_assay_data(str(data_path), cache=True)
 
     if df is None:
         print(f"ERROR: Could not load data from {data_path}")
@@ -66,6 +86,12 @@ def main():
     print(f"Loaded {len(df)} assay records")
     print(f"Columns: {list(df.columns)}")
 
+    cache_dir = args.cache_dir or str(data_path.parent / DEFAULT_STEP_CACHE_DIR)
+    steps = StepCache(cache_dir, force=args.rebuild)
+    # load_assay_data(cache=True) has just validated the sidecar, so its
+    # stored hash is reused instead of hashing the whole CSV again
+    steps.add_input('data', source_hash(str(data_path)), frame=df)
+
     # =========================================================================
     # Step 2: Explore the data
     # =========================================================================
@@ -82,7 +108,8 @@ def main():
     # =========================================================================
     print("\n--- Step 3: Data Quality Check ---")
 
-    quality_report = validate_data_quality(df)
+    quality_report = steps.run('quality_report', validate_data_quality, df,
+                               depends=['data'])
     if quality_report:
         # TODO: Print quality report findings
         pass
@@ -94,7 +121,8 @@ def main():
 
     # TODO: Use YOUR quality_filter parameter from ASSIGNMENT.md
     quality_filter = "Good"  # Replace with your parameter
-    good_samples = filter_by_quality(df, quality_filter)
+    good_samples = steps.run('filtered', filter_by_quality, df, quality_filter,
+                             depends=['data'])
 
     if good_samples is not None:
         print(f"Filtered to {len(good_samples)} '{quality_filter}' quality samples")
@@ -107,7 +135,8 @@ def main():
     # TODO: Use YOUR primary_element parameter from ASSIGNMENT.md
     primary_element = "Au_ppm"  # Replace with your parameter
 
-    stats = calculate_element_statistics(df, primary_element)
+    stats = steps.run('statistics', calculate_element_statistics, df, primary_element,
+                      depends=['data'])
     if stats:
         print(f"\nStatistics for {primary_element}:")
         for key, value in stats.items():
@@ -124,7 +153,8 @@ def main():
     # TODO: Use YOUR anomaly_threshold_multiplier from ASSIGNMENT.md
     threshold_multiplier = 2.5  # Replace with your parameter
 
-    anomalies = detect_anomalies(df, primary_element, threshold_multiplier)
+    anomalies = steps.run('anomalies', detect_anomalies, df, primary_element,
+                          threshold_multiplier, depends=['data'])
     if anomalies is not None:
         print(f"Found {len(anomalies)} anomalous samples")
         if len(anomalies) > 0:
@@ -139,18 +169,19 @@ def main():
     elements = ["Au_ppm", "Cu_pct", "Ag_ppm", "Fe_pct", "S_pct"]
 
     print("\nCorrelation matrix:")
+    corr = steps.run('correlations', correlation_matrix, df, elements,
+                     depends=['data'])
     for i, elem1 in enumerate(elements):
         for elem2 in elements[i+1:]:
-            corr = correlate_elements(df, elem1, elem2)
-            if corr is not None:
-                print(f"  {elem1} vs {elem2}: {corr:.3f}")
+            print(f"  {elem1} vs {elem2}: {corr.loc[elem1, elem2]:.3f}")
 
     # =========================================================================
     # Step 8: Generate summary report
     # =========================================================================
     print("\n--- Step 8: Summary Report ---")
 
-    report = generate_summary_report(df, elements)
+    report = steps.run('summary_report', generate_summary_report, df, elements,
+                       depends=['data'])
     if report:
         print("\nSummary Report:")
         for elem, elem_report in report.items():
@@ -178,6 +209,9 @@ def main():
     # =========================================================================
     # Analysis complete
     # =========================================================================
+    print(f"\nSteps computed: {', '.join(steps.executed) or 'none'}")
+    print(f"Steps reused from cache: {', '.join(steps.reused) or 'none'}")
+
     print("\n" + "=" * 60)
     print("Analysis Complete!")
     print("=" * 60)
@@ -0,0 +1,202 @@
+"""
+GGY3601 Coding Assignment 2: Parallel Analysis Module
+
+This module runs per-hole analysis functions across a pool of worker
+processes. The numeric columns are placed in shared memory once, so workers
+read their holes directly instead of receiving pickled DataFrames.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import pandas as pd
+import numpy as np
+
+from geochemical_analyzer import calculate_interval_weighted_mean, get_element_by_hole
+
+
+# Shared block attached by each worker process (see _init_worker).
+_worker_state = {}
+
+
+def _attach_shared_memory(name):
+    """Attach to an existing shared memory block without taking ownership."""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13: workers share the parent's resource tracker, so the
+        # registration is a no-op and the parent still owns the unlink.
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_worker(name, shape, columns):
+    """Worker initializer: map the shared column block into this process."""
+    shm = _attach_shared_memory(name)
+    _worker_state['shm'] = shm
+    _worker_state['block'] = np.ndarray(shape, dtype='float64', buffer=shm.buf)
+    _worker_state['columns'] = columns
+
+
+def _run_holes(func, element, holes, kwargs):
+    """
+    Run func on a batch of holes.
+
+    Args:
+        func (callable): Per-hole function taking (df, element, **kwargs).
+        element (str): Element column name.
+        holes (list): (position, hole_id, start, stop) tuples; rows
+            start:stop of the shared block belong to that hole.
+        kwargs (dict): Extra keyword arguments for func.
+
+    Returns:
+        list: (position, result) tuples.
+    """
+    block = _worker_state['block']
+    columns = _worker_state['columns']
+    results = []
+    for position, hole_id, start, stop in holes:
+        hole_df = pd.DataFrame(block[start:stop], columns=columns)
+        hole_df.insert(0, 'hole_id', hole_id)
+        results.append((position, func(hole_df, element, **kwargs)))
+    return results
+
+
+def _partition_by_hole(df):
+    """
+    Return the row order and per-hole row ranges for a hole-sorted layout.
+
+    Holes are ordered the same way as df.groupby('hole_id'), and rows keep
+    their original relative order within a hole.
+
+    Returns:
+        tuple: (order, hole_ids, starts, stops)
+    """
+    codes, hole_ids = pd.factorize(df['hole_id'], sort=True)
+    order = np.argsort(codes, kind='stable')
+    counts = np.bincount(codes[codes >= 0], minlength=len(hole_ids))
+    stops = np.cumsum(counts)
+    starts = stops - counts
+    # Rows with a missing hole_id (code -1) sort first; skip past them
+    skipped = int((codes < 0).sum())
+    return order, list(hole_ids), starts + skipped, stops + skipped
+
+
+def run_per_hole(df, func, element, n_workers=None, columns=None, **kwargs):
+    """
+    Run a per-hole analysis function on every drill hole in parallel.
+
+    The frame is partitioned by hole_id and the numeric columns are copied
+    once into a shared memory block in hole order. Each worker rebuilds a
+    small DataFrame for each of its holes from that block, so no DataFrames
+    are pickled. Results come back in the same order as a serial groupby
+    over hole_id, whatever the number of workers.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        func (callable): Module-level function called as
+            ``func(hole_df, element, **kwargs)`` for each hole, where
+            hole_df has a 'hole_id' column plus the shared columns.
+        element (str): Element column name.
+        n_workers (int, optional): Number of worker processes. Defaults to
+            the CPU count. With 1 worker the holes run in this process.
+        columns (list, optional): Numeric columns to share with workers.
+            Defaults to from_depth, to_depth and the element.
+        **kwargs: Extra keyword arguments passed to func.
+
+    Returns:
+        list: (hole_id, result) pairs in hole order.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> results = run_per_hole(df, calculate_interval_weighted_mean, 'Au_ppm')
+    """
+    if columns is None:
+        columns = ['from_depth', 'to_depth', element]
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+
+    order, hole_ids, starts, stops = _partition_by_hole(df)
+    holes = [(i, hole_ids[i], int(starts[i]), int(stops[i]))
+             for i in range(len(hole_ids))]
+    if not holes:
+        return []
+
+    values = df[columns].to_numpy(dtype='float64', na_value=np.nan)
+    shape = values.shape
+    shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    try:
+        block = np.ndarray(shape, dtype='float64', buffer=shm.buf)
+        np.take(values, order, axis=0, out=block)
+        del values
+
+        if n_workers == 1:
+            _worker_state.update(block=block, columns=columns)
+            try:
+                results = _run_holes(func, element, holes, kwargs)
+            finally:
+                _worker_state.clear()
+        else:
+            # A few batches per worker keeps the pool busy when hole sizes vary
+            n_batches = min(len(holes), n_workers * 4)
+            batches = [batch.tolist() for batch in
+                       np.array_split(np.arange(len(holes)), n_batches)]
+            with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker,
+                                     initargs=(shm.name, shape, columns)) as pool:
+                futures = [pool.submit(_run_holes, func, element,
+                                       [holes[i] for i in batch], kwargs)
+                           for batch in batches]
+                results = [item for future in futures for item in future.result()]
+        del block
+    finally:
+        shm.close()
+        shm.unlink()
+
+    results.sort(key=lambda item: item[0])
+    return [(hole_ids[position], result) for position, result in results]
+
+
+def parallel_element_by_hole(df, element, n_workers=None):
+    """
+    Parallel version of get_element_by_hole.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        element (str): Column name for the element to analyze.
+        n_workers (int, optional): Number of worker processes.
+
+    Returns:
+        pandas.DataFrame: Grouped statistics by hole_id, with the same
+            rows, values and order as get_element_by_hole(df, element).
+    """
+    results = run_per_hole(df, get_element_by_hole, element, n_workers=n_workers,
+                           columns=[element])
+    if not results:
+        return get_element_by_hole(df, element)
+    result = pd.concat([stats for _, stats in results])
+    result.index = pd.Index([hole_id for hole_id, _ in results], name='hole_id')
+    return result
+
+
+def parallel_interval_weighted_mean(df, element, n_workers=None):
+    """
+    Interval-weighted mean of an element for every hole, in parallel.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        element (str): Column name for the element to analyze.
+        n_workers (int, optional): Number of worker processes.
+
+    Returns:
+        pandas.Series: Weighted mean per hole_id.
+    """
+    results = run_per_hole(df, calculate_interval_weighted_mean, element,
+                           n_workers=n_workers)
+    return pd.Series([value for _, value in results],
+                     index=pd.Index([hole_id for hole_id, _ in results], name='hole_id'),
+                     name=element, dtype='float64')
+
@@ -0,0 +1,297 @@
+"""
+GGY3601 Coding Assignment 2: Pipeline Module
+
+This module provides a lazy pipeline builder for the usual load, clean,
+filter and anomaly detection chain. Operations are recorded first and the
+plan is optimized before the CSV file is read once.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import numpy as np
+
+from assay_schema import ASSAY_COLUMNS, concat_assay_chunks
+from geochemical_analyzer import detect_anomalies, load_assay_data, quality_mask
+from data_cleaning import (
+    depth_range_mask,
+    handle_missing_values,
+    standardize_lithology_names,
+)
+
+
+DEFAULT_CHUNKSIZE = 100_000
+
+
+class _Step:
+    """
+    One recorded pipeline operation.
+
+    kind is 'filter' (row-local, func returns a boolean mask), 'map'
+    (row-local, func returns a new frame) or 'barrier' (needs the whole
+    frame, e.g. to compute a column mean). reads and writes are sets of
+    column names; reads=None means the step looks at every column. A
+    filter that load_assay_data can apply while parsing also carries the
+    equivalent ``where`` predicate.
+    """
+
+    def __init__(self, kind, label, func, reads, writes=frozenset(), where=None):
+        self.kind = kind
+        self.label = label
+        self.func = func
+        self.reads = None if reads is None else frozenset(reads)
+        self.writes = None if writes is None else frozenset(writes)
+        self.where = where
+
+    def commutes_with(self, other):
+        """Whether this filter can move in front of the other step."""
+        if self.kind != 'filter' or other.kind == 'barrier':
+            return False
+        if other.writes is None:
+            return False
+        if self.reads is None:
+            return not other.writes
+        return not (self.reads & other.writes)
+
+
+class _Plan:
+    """Optimized plan: what to scan, what to run per chunk, and the rest."""
+
+    def __init__(self, columns, where, chunk_steps, frame_steps, output):
+        self.columns = columns
+        self.where = where
+        self.chunk_steps = chunk_steps
+        self.frame_steps = frame_steps
+        self.output = output
+
+
+def _fuse(steps):
+    """Group consecutive filters so their masks are combined and applied once."""
+    groups = []
+    for step in steps:
+        if step.kind == 'filter' and groups and groups[-1][0].kind == 'filter':
+            groups[-1].append(step)
+        else:
+            groups.append([step])
+    return groups
+
+
+def _run(groups, df):
+    """Run fused step groups on a frame."""
+    for group in groups:
+        if group[0].kind == 'filter':
+            mask = np.ones(len(df), dtype=bool)
+            for step in group:
+                mask &= step.func(df)
+            df = df[mask]
+        else:
+            df = group[0].func(df)
+    return df
+
+
+class AssayPipeline:
+    """
+    Lazy pipeline over an assay CSV file.
+
+    Methods named after the analyzer and cleaning functions record an
+    operation and return a new pipeline; nothing is read until collect().
+    Before running, the plan is optimized:
+
+    - Filters move ahead of steps they do not depend on, so rows are
+      dropped as early as possible.
+    - Quality and depth filters that reach the front are handed to
+      load_assay_data as its ``where`` predicate.
+    - Only the columns that some step or the output needs are parsed, and
+      steps that only write columns nobody uses are dropped.
+    - Row-local steps before the first whole-frame step (mean or median
+      imputation, anomaly detection) run on each chunk as it is parsed,
+      so rejected rows never reach the full frame.
+    - Consecutive filters are fused into one boolean mask.
+
+    The result is the same as calling the functions one after another on
+    the fully loaded frame. Call explain() to see the optimized plan.
+
+    Args:
+        filename (str): Path to the CSV file containing assay data.
+        chunksize (int): Rows parsed per chunk.
+        float32 (bool): If True, parse element columns as float32.
+
+    Example:
+        >>> pipeline = (AssayPipeline('data/geochemical_assays.csv')
+        ...             .standardize_lithology_names()
+        ...             .handle_missing_values('median', columns=['Au_ppm'])
+        ...             .filter_by_quality('Good')
+        ...             .detect_anomalies('Au_ppm', 2.5)
+        ...             .select(['sample_id', 'hole_id', 'Au_ppm']))
+        >>> print(pipeline.explain())
+        >>> anomalies = pipeline.collect()
+    """
+
+    def __init__(self, filename, chunksize=DEFAULT_CHUNKSIZE, float32=False):
+        if chunksize <= 0:
+            raise ValueError("chunksize must be a positive integer")
+        self.filename = filename
+        self.chunksize = chunksize
+        self.float32 = float32
+        self._steps = []
+        self._output = None
+
+    def _extend(self, step=None, output=None):
+        pipeline = AssayPipeline(self.filename, self.chunksize, self.float32)
+        pipeline._steps = self._steps + ([step] if step is not None else [])
+        pipeline._output = self._output if output is None else list(output)
+        return pipeline
+
+    def standardize_lithology_names(self):
+        """Record standardize_lithology_names."""
+        return self._extend(_Step('map', 'standardize_lithology_names',
+                                  standardize_lithology_names,
+                                  reads={'lithology'}, writes={'lithology'}))
+
+    def handle_missing_values(self, strategy='drop', columns=None, by=None,
+                              interpolation='linear', max_gap=None):
+        """Record handle_missing_values; only 'drop' and 'zero' run per chunk."""
+        label = f"handle_missing_values(strategy={strategy!r}, columns={columns!r})"
+        if by is not None:
+            if strategy not in ('mean', 'median'):
+                raise ValueError("by is only supported for the 'mean' and 'median' strategies")
+            label = label[:-1] + f", by={by!r})"
+        if strategy == 'drop':
+            # Without columns, a row is dropped for a gap in any column
+            return self._extend(_Step('filter', label, lambda df: (
+                df if columns is None else df[columns]).notna().all(axis=1).to_numpy(),
+                reads=columns))
+        if strategy not in ('mean', 'median', 'zero', 'downhole'):
+            raise ValueError(f"Unknown missing value strategy: {strategy}")
+
+        def func(df):
+            return handle_missing_values(df, strategy, columns, by=by,
+                                         interpolation=interpolation, max_gap=max_gap)
+
+        keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        if strategy == 'downhole':
+            # Neighbouring samples of a hole may fall in different chunks
+            label = label[:-1] + f", interpolation={interpolation!r}, max_gap={max_gap!r})"
+            keys = ['hole_id', 'from_depth', 'to_depth']
+        kind = 'map' if strategy == 'zero' else 'barrier'
+        return self._extend(_Step(kind, label, func, reads=set(columns or ()) | set(keys),
+                                  writes=columns))
+
+    def filter_by_quality(self, quality_level):
+        """Record filter_by_quality."""
+        return self._extend(_Step('filter', f"sample_quality == {quality_level!r}",
+                                  lambda df: quality_mask(df, quality_level),
+                                  reads={'sample_quality'},
+                                  where={'sample_quality': quality_level}))
+
+    def filter_by_depth_range(self, min_depth=None, max_depth=None):
+        """Record filter_by_depth_range."""
+        where = {}
+        if min_depth is not None:
+            where['from_depth'] = (min_depth, None)
+        if max_depth is not None:
+            where['to_depth'] = (None, max_depth)
+        return self._extend(_Step('filter', f"depth within [{min_depth}, {max_depth}]",
+                                  lambda df: depth_range_mask(df, min_depth, max_depth),
+                                  reads={'from_depth', 'to_depth'}, where=where))
+
+    def detect_anomalies(self, element, threshold_multiplier, method='std'):
+        """Record detect_anomalies; the threshold needs the whole frame."""
+        def func(df):
+            return detect_anomalies(df, element, threshold_multiplier, method)
+
+        return self._extend(_Step('barrier', f"detect_anomalies({element!r}, "
+                                  f"{threshold_multiplier}, method={method!r})",
+                                  func, reads={element}))
+
+    def select(self, columns):
+        """Keep only these columns in the result."""
+        return self._extend(output=columns)
+
+    def _optimize(self):
+        """Push filters down, prune columns and split the plan at the first barrier."""
+        steps = []
+        for step in self._steps:
+            position = len(steps)
+            while position > 0 and step.commutes_with(steps[position - 1]):
+                position -= 1
+            # Filters commute with each other; keep them in the order given
+            while position < len(steps) and steps[position].kind == 'filter':
+                position += 1
+            steps.insert(position, step)
+
+        # Leading filters with a simple predicate go to the loader
+        lead = next((i for i, step in enumerate(steps) if step.kind != 'filter'),
+                    len(steps))
+        where = {}
+        remaining = []
+        for step in steps[:lead]:
+            if step.where is not None and not (where.keys() & step.where.keys()):
+                where.update(step.where)
+            else:
+                remaining.append(step)
+        steps = remaining + steps[lead:]
+
+        # Walk back from the output: drop steps that only write columns
+        # nobody reads later, and collect the columns that must be parsed.
+        output = self._output
+        needed = set(ASSAY_COLUMNS if output is None else output)
+        kept = []
+        for step in reversed(steps):
+            if step.kind != 'filter' and step.writes and not (step.writes & needed):
+                continue
+            kept.append(step)
+            needed |= set(ASSAY_COLUMNS) if step.reads is None else step.reads
+        steps = kept[::-1]
+        columns = [column for column in ASSAY_COLUMNS if column in needed]
+
+        split = next((i for i, step in enumerate(steps) if step.kind == 'barrier'),
+                     len(steps))
+        return _Plan(columns, where, _fuse(steps[:split]), _fuse(steps[split:]), output)
+
+    def explain(self):
+        """
+        Describe the optimized plan.
+
+        Returns:
+            str: One line per stage, in execution order.
+        """
+        plan = self._optimize()
+        lines = [f"scan {self.filename} (chunksize={self.chunksize})",
+                 f"  columns: {', '.join(plan.columns)}"]
+        if plan.where:
+            lines.append(f"  where: {plan.where}")
+        for title, groups in (('per chunk', plan.chunk_steps),
+                              ('on full frame', plan.frame_steps)):
+            if groups:
+                lines.append(f"{title}:")
+            for group in groups:
+                if group[0].kind == 'filter':
+                    lines.append("  filter " + " & ".join(step.label for step in group))
+                else:
+                    lines.append("  " + group[0].label)
+        if plan.output is not None:
+            lines.append(f"select {', '.join(plan.output)}")
+        return "\n".join(lines)
+
+    def collect(self):
+        """
+        Run the pipeline.
+
+        Returns:
+            pandas.DataFrame: The result, with row labels from the original
+                file order, or None if the file does not exist.
+        """
+        plan = self._optimize()
+        reader = load_assay_data(self.filename, chunksize=self.chunksize,
+                                 float32=self.float32, columns=plan.columns,
+                                 where=plan.where)
+        if reader is None:
+            return None
+        frames = [_run(plan.chunk_steps, chunk) for chunk in reader]
+        df = concat_assay_chunks(frames) if frames else reader.empty()
+        df = _run(plan.frame_steps, df)
+        if plan.output is not None:
+            df = df[plan.output]
+        return df
@@ -0,0 +1,352 @@
+"""
+GGY3601 Coding Assignment 2: Result Cache Module
+
+This module memoizes analysis results for interactive sessions. Results are
+keyed by a fingerprint of the DataFrame columns a function reads plus its
+arguments, so repeated calls on an unchanged frame are answered from memory.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import copy
+import functools
+import hashlib
+import inspect
+import pickle
+from collections import OrderedDict
+
+import pandas as pd
+import numpy as np
+
+from frame_cache import FrameCache, same_storage
+from geochemical_analyzer import calculate_element_statistics, correlate_elements
+from data_cleaning import validate_data_quality
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _hash_column(series):
+    """Hash the values of one column (the index is not included)."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f'{series.name}|{series.dtype}|{len(series)}'.encode())
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        digest.update(np.ascontiguousarray(series.cat.codes.to_numpy()).tobytes())
+        digest.update(repr(list(series.cat.categories)).encode())
+    elif isinstance(series.dtype, np.dtype) and series.dtype.kind in 'biufcmM':
+        digest.update(np.ascontiguousarray(series.to_numpy()).tobytes())
+    else:
+        digest.update(pd.util.hash_pandas_object(series, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# df -> {column: (held Series, digest)}
+_fingerprint_cache = FrameCache()
+
+
+def frame_fingerprint(df, columns=None):
+    """
+    Return a fingerprint of the values in some columns of a DataFrame.
+
+    Two frames with equal values in those columns get the same fingerprint,
+    whatever their index. Column hashes are remembered per DataFrame and
+    reused while the column keeps the same storage (see
+    DepthIndex.is_current), so fingerprinting an unchanged frame again
+    costs almost nothing.
+
+    Args:
+        df (pandas.DataFrame): DataFrame to fingerprint.
+        columns (list, optional): Columns to include. Defaults to all.
+
+    Returns:
+        str: Hex digest.
+    """
+    if columns is None:
+        columns = list(df.columns)
+    hashes = _fingerprint_cache.get(df)
+    if hashes is None:
+        hashes = _fingerprint_cache.set(df, {})
+
+    digest = hashlib.blake2b(digest_size=16)
+    for column in columns:
+        series = df[column]
+        held = hashes.get(column)
+        if held is None or not same_storage(held[0], series):
+            held = (series, _hash_column(series))
+            hashes[column] = held
+        digest.update(held[1].encode())
+    return digest.hexdigest()
+
+
+def _copy_on_write():
+    """Whether pandas Copy-on-Write is on (it always is from pandas 3.0)."""
+    if int(pd.__version__.split('.')[0]) >= 3:
+        return True
+    return pd.get_option('mode.copy_on_write') is True
+
+
+def _argument_key(value):
+    """
+    Stable cache-key part for one argument.
+
+    DataFrames and Series are keyed by their values (see frame_fingerprint)
+    and NumPy arrays by their dtype, shape and data, since their repr is
+    abbreviated for large inputs. Containers are keyed item by item, and
+    anything else by its repr.
+    """
+    if isinstance(value, pd.DataFrame):
+        return ('DataFrame', frame_fingerprint(value))
+    if isinstance(value, pd.Series):
+        return ('Series', _hash_column(value))
+    if isinstance(value, np.ndarray):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(f'{value.dtype}|{value.shape}'.encode())
+        if value.dtype.kind == 'O':
+            digest.update(pd.util.hash_array(value.ravel()).tobytes())
+        else:
+            digest.update(np.ascontiguousarray(value).tobytes())
+        return ('ndarray', digest.hexdigest())
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__, tuple(_argument_key(item) for item in value))
+    if isinstance(value, dict):
+        return ('dict', tuple((repr(key), _argument_key(item)) for key, item in value.items()))
+    return repr(value)
+
+
+def _share_result(value):
+    """
+    Hand out a cached result without copying its data.
+
+    dicts, lists and tuples are rebuilt so callers can change them.
+    DataFrames and Series are returned as shallow copies; under pandas
+    Copy-on-Write a write to one allocates new storage, so the cached data
+    is never changed (without Copy-on-Write they are copied in full). NumPy
+    arrays are returned as read-only views.
+    """
+    if isinstance(value, dict):
+        return {key: _share_result(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_share_result(item) for item in value]
+    if type(value) is tuple:
+        return tuple(_share_result(item) for item in value)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not _copy_on_write())
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, (int, float, str, bytes, bool, type(None), np.generic)):
+        return value
+    return copy.deepcopy(value)
+
+
+def _result_size(value):
+    """Approximate the memory held by a cached result."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(deep=True).sum())
+    try:
+        return len(pickle.dumps(value))
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return 1024
+
+
+class ResultCache:
+    """
+    Least-recently-used store of analysis results with a memory budget.
+
+    Args:
+        max_bytes (int): Approximate memory budget. The least recently used
+            results are evicted when the total size would exceed it.
+
+    Attributes:
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to compute the result.
+        evictions (int): Results dropped to stay within the budget.
+
+    Example:
+        >>> cache = ResultCache(max_bytes=64 * 1024 * 1024)
+        >>> stats = memoize(calculate_element_statistics,
+        ...                 lambda df, element, **kwargs: [element], cache)
+        >>> stats(df, 'Au_ppm')
+        >>> stats(df, 'Au_ppm')
+        >>> print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Look up a result, marking it as recently used.
+
+        Returns:
+            tuple: (True, value) on a hit, (False, None) on a miss.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[0]
+
+    def put(self, key, value):
+        """Store a result, evicting old ones to stay within max_bytes."""
+        size = _result_size(value)
+        if key in self._entries:
+            self.total_bytes -= self._entries.pop(key)[1]
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self.total_bytes += size
+        while self.total_bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self.total_bytes -= evicted
+            self.evictions += 1
+
+    def invalidate(self, df=None, func=None):
+        """
+        Drop cached results.
+
+        With no arguments everything is dropped. Otherwise only the results
+        computed from df (as it is now) and/or by func are dropped. Passing
+        df also forgets its column hashes, which is needed after writing
+        into a column in place without pandas Copy-on-Write.
+
+        Args:
+            df (pandas.DataFrame, optional): Frame whose results to drop.
+            func (callable, optional): Function whose results to drop.
+
+        Returns:
+            int: Number of results dropped.
+        """
+        if df is None and func is None:
+            dropped = len(self._entries)
+            self._entries.clear()
+            self.total_bytes = 0
+            return dropped
+
+        fingerprints = None
+        if df is not None:
+            # Use the remembered hashes first: after an undetected in-place
+            # write they still match the results computed before it.
+            fingerprints = {frame_fingerprint(df, list(columns))
+                            for columns in {key[1] for key in self._entries}
+                            if set(columns) <= set(df.columns)}
+            _fingerprint_cache.discard(df)
+        name = None if func is None else _qualified_name(func)
+        stale = [key for key in self._entries
+                 if (name is None or key[0] == name)
+                 and (fingerprints is None or key[2] in fingerprints)]
+        for key in stale:
+            self.total_bytes -= self._entries.pop(key)[1]
+        return len(stale)
+
+    def stats(self):
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: hits, misses, evictions, entries and bytes.
+        """
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(self._entries), 'bytes': self.total_bytes}
+
+
+RESULT_CACHE = ResultCache()
+
+
+def _qualified_name(func):
+    """Name used for a function in cache keys."""
+    return f'{func.__module__}.{func.__qualname__}'
+
+
+def memoize(func, columns, cache=None, volatile=()):
+    """
+    Wrap an analysis function so its results are cached.
+
+    The cache key is the function, the fingerprint of the columns it reads
+    and its bound arguments (with defaults filled in; frames and arrays are
+    keyed by their values, see _argument_key). Calls whose first argument
+    is not a DataFrame (e.g. chunk streams) are passed straight through.
+    A hit hands out the cached result without copying its data (see
+    _share_result), so callers may modify what they get back at no cost to
+    the cache.
+
+    Args:
+        func (callable): Function taking a DataFrame as first argument.
+        columns (callable): Called with the same arguments as func; returns
+            the list of columns the result depends on, or None for all.
+        cache (ResultCache, optional): Cache to use. Defaults to
+            RESULT_CACHE.
+        volatile (tuple): Keys of a dict result that describe one run
+            rather than the data (e.g. wall-clock timings). They are
+            returned by the call that computes the result but are not
+            cached, so a hit never reports measurements of work it did
+            not do.
+
+    Returns:
+        callable: The memoized function.
+    """
+    if cache is None:
+        cache = RESULT_CACHE
+    signature = inspect.signature(func)
+    name = _qualified_name(func)
+
+    @functools.wraps(func)
+    def wrapper(df, *args, **kwargs):
+        if not isinstance(df, pd.DataFrame):
+            return func(df, *args, **kwargs)
+        bound = signature.bind(df, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = tuple(bound.arguments.items())[1:]
+        used = columns(df, *args, **kwargs)
+        used = tuple(df.columns) if used is None else tuple(used)
+        key = (name, used, frame_fingerprint(df, list(used)),
+               tuple((argument, _argument_key(value)) for argument, value in arguments))
+        found, value = cache.get(key)
+        if found:
+            return _share_result(value)
+        value = func(df, *args, **kwargs)
+        if volatile and isinstance(value, dict):
+            stored = {k: item for k, item in value.items() if k not in volatile}
+        else:
+            stored = value
+        cache.put(key, stored)
+        return _share_result(value)
+
+    wrapper.cache = cache
+    return wrapper
+
+
+def _element_columns(df, element, *args, **kwargs):
+    return [element]
+
+
+def _pair_columns(df, element1, element2, *args, **kwargs):
+    return [element1, element2]
+
+
+def _all_columns(df, *args, **kwargs):
+    return None
+
+
+# Opt-in memoized versions of the functions most often repeated in
+# interactive sessions. They share RESULT_CACHE.
+cached_element_statistics = memoize(calculate_element_statistics, _element_columns)
+cached_correlate_elements = memoize(correlate_elements, _pair_columns)
+cached_validate_data_quality = memoize(validate_data_quality, _all_columns,
+                                       volatile=('timings',))
@@ -0,0 +1,115 @@
+"""
+GGY3601 Coding Assignment 2: Selection Module
+
+This module provides a lazy row selection over an assay DataFrame. Filters
+are combined as boolean masks and rows are only copied once, at the end.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import numpy as np
+
+from geochemical_analyzer import quality_mask
+from data_cleaning import depth_range_mask, outlier_mask
+
+
+class Selection:
+    """
+    Lazy selection of rows from an assay DataFrame.
+
+    Each filter method returns a new Selection whose mask is narrowed to the
+    rows that pass; the DataFrame itself is never copied. Filters apply in
+    the order they are chained, so outlier bounds are computed from the rows
+    still selected at that point, the same as chaining the DataFrame
+    filters. Call materialize() to get the rows as a DataFrame, or
+    positions() / values() to work on NumPy arrays directly.
+
+    Args:
+        df (pandas.DataFrame): DataFrame containing assay data.
+        mask (numpy.ndarray, optional): Boolean mask of selected rows.
+            Defaults to all rows.
+
+    Example:
+        >>> df = load_assay_data('data/geochemical_assays.csv')
+        >>> selection = (Selection(df).quality('Good')
+        ...              .depth_range(max_depth=200)
+        ...              .without_outliers('Au_ppm'))
+        >>> clean = selection.materialize()
+    """
+
+    def __init__(self, df, mask=None):
+        self.df = df
+        if mask is None:
+            mask = np.ones(len(df), dtype=bool)
+        self.mask = np.asarray(mask, dtype=bool)
+        if self.mask.shape != (len(df),):
+            raise ValueError("mask must have one entry per row")
+
+    def __len__(self):
+        return int(np.count_nonzero(self.mask))
+
+    def where(self, mask):
+        """
+        Keep only the selected rows where mask is True.
+
+        Args:
+            mask (array-like): Boolean mask with one entry per row of df.
+
+        Returns:
+            Selection: The narrowed selection.
+        """
+        return Selection(self.df, self.mask & np.asarray(mask, dtype=bool))
+
+    def quality(self, quality_level):
+        """Keep rows with the given sample quality (see filter_by_quality)."""
+        return self.where(quality_mask(self.df, quality_level))
+
+    def depth_range(self, min_depth=None, max_depth=None, use_index=False):
+        """Keep rows within a depth range (see filter_by_depth_range)."""
+        return self.where(depth_range_mask(self.df, min_depth, max_depth, use_index))
+
+    def without_outliers(self, element, method='iqr', threshold=1.5,
+                         quantiles='exact', rule='any'):
+        """Drop outliers among the selected rows (see remove_outliers)."""
+        return Selection(self.df, outlier_mask(self.df, element, method, threshold,
+                                               quantiles, rows=self.mask, rule=rule))
+
+    def positions(self):
+        """
+        Return the selected row positions.
+
+        Returns:
+            numpy.ndarray: Sorted integer positions for use with df.iloc.
+        """
+        return np.flatnonzero(self.mask)
+
+    def values(self, column, dtype='float64'):
+        """
+        Return one column of the selected rows as a NumPy array.
+
+        Only that column is gathered, so this is cheaper than materializing
+        the whole frame when a single element is needed.
+
+        Args:
+            column (str): Column name.
+            dtype (str): Result dtype. Missing values become NaN.
+
+        Returns:
+            numpy.ndarray: Values of the selected rows.
+        """
+        return self.df[column].to_numpy(dtype=dtype, na_value=np.nan)[self.mask]
+
+    def materialize(self, columns=None):
+        """
+        Copy the selected rows into a new DataFrame.
+
+        Args:
+            columns (list, optional): Columns to keep. Defaults to all.
+
+        Returns:
+            pandas.DataFrame: The selected rows, with the original index.
+        """
+        df = self.df if columns is None else self.df[columns]
+        return df.iloc[self.positions()]
@@ -0,0 +1,222 @@
+"""
+GGY3601 Coding Assignment 2: Step Cache Module
+
+This module caches the results of workflow steps on disk, so re-running
+main.py only recomputes the steps whose inputs or parameters changed.
+
+Author: [YOUR NAME]
+Student ID: [YOUR ID]
+Date: [DATE]
+"""
+
+import glob
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+import types
+
+import pandas as pd
+
+from frame_cache import FrameCache
+from result_cache import frame_fingerprint
+
+
+# Bump to invalidate every cached step, e.g. after changing the pickle layout.
+STEP_CACHE_VERSION = 1
+
+DEFAULT_STEP_CACHE_DIR = '.step_cache'
+
+
+def _local_modules(module):
+    """
+    Return the module and the modules it uses from its own directory.
+
+    Modules are followed transitively through the names each one binds
+    (imported modules, functions and classes), so a step defined in main.py
+    also depends on data_cleaning, grouped_stats and so on.
+    """
+    root = os.path.dirname(os.path.abspath(module.__file__))
+    found = {}
+    pending = [module]
+    while pending:
+        current = pending.pop()
+        if current.__name__ in found:
+            continue
+        found[current.__name__] = current
+        for value in vars(current).values():
+            name = value.__name__ if isinstance(value, types.ModuleType) \
+                else getattr(value, '__module__', None)
+            used = sys.modules.get(name) if isinstance(name, str) else None
+            path = getattr(used, '__file__', None)
+            if path and os.path.dirname(os.path.abspath(path)) == root:
+                pending.append(used)
+    return [found[name] for name in sorted(found)]
+
+
+def _source_hash(func):
+    """
+    Hash the source of the module defining func and the local modules it uses.
+
+    Whole modules are hashed rather than just the function, so editing a
+    helper it calls, in the same module or in another module of the
+    project, also invalidates its results.
+    """
+    module = inspect.getmodule(func)
+    if getattr(module, '__file__', None) is None:
+        return hashlib.sha256(f'{func.__module__}.{func.__qualname__}'.encode()).hexdigest()
+    digest = hashlib.sha256()
+    for used in _local_modules(module):
+        with open(used.__file__, 'rb') as f:
+            digest.update(f'{used.__name__}|'.encode() + f.read())
+    return digest.hexdigest()
+
+
+class StepCache:
+    """
+    On-disk cache of workflow step results.
+
+    Each step is keyed by its name, the source of the module defining the
+    function it runs and of the project modules that module uses, its
+    parameters and the keys of the steps it depends
+    on. A change anywhere upstream therefore changes the key of every step
+    below it, while steps whose inputs are unchanged are loaded from disk.
+    Results are stored with pickle, one file per step.
+
+    DataFrames returned by steps, and frames registered with add_input, are
+    remembered with the name that produced them; passing one to a step that
+    does not list that name in ``depends`` raises ValueError. Any other
+    DataFrame argument is keyed by its values (see frame_fingerprint).
+
+    Args:
+        cache_dir (str): Directory for the cached results.
+        force (bool): If True, run every step and overwrite the cache.
+
+    Attributes:
+        keys (dict): Step name to key, for steps seen in this run.
+        executed (list): Names of steps that were computed.
+        reused (list): Names of steps loaded from the cache.
+
+    Example:
+        >>> steps = StepCache('data/.step_cache')
+        >>> steps.add_input('data', file_fingerprint(path)['sha256'], frame=df)
+        >>> report = steps.run('quality_report', validate_data_quality, df,
+        ...                    depends=['data'])
+    """
+
+    def __init__(self, cache_dir, force=False):
+        self.cache_dir = cache_dir
+        self.force = force
+        self.keys = {}
+        self.executed = []
+        self.reused = []
+        # DataFrame -> name of the step or input it came from
+        self._sources = FrameCache()
+
+    def add_input(self, name, digest, frame=None):
+        """
+        Register an external input, such as a data file, by its hash.
+
+        Args:
+            name (str): Name that steps use in ``depends``.
+            digest (str): Content hash of the input.
+            frame (pandas.DataFrame, optional): The data loaded from the
+                input. Steps passed this frame must list name in depends.
+        """
+        self.keys[name] = digest
+        if frame is not None:
+            self._sources.set(frame, name)
+
+    def key(self, name, func, args, kwargs, depends):
+        """
+        Compute the cache key of a step.
+
+        DataFrame arguments that came from a step or registered input are
+        identified through ``depends``; other DataFrames are keyed by their
+        values. All other arguments must have a stable repr().
+
+        Returns:
+            str: Hex digest.
+
+        Raises:
+            ValueError: If depends names an unknown step or input, or a
+                DataFrame argument comes from one that depends leaves out.
+        """
+        unknown = [dependency for dependency in depends if dependency not in self.keys]
+        if unknown:
+            raise ValueError(f"Step '{name}' depends on unknown steps or inputs: {unknown}")
+        digest = hashlib.sha256()
+        digest.update(f'{STEP_CACHE_VERSION}|{name}|{_source_hash(func)}'.encode())
+        for dependency in depends:
+            digest.update(f'|{dependency}={self.keys[dependency]}'.encode())
+        for value in list(args) + list(kwargs.values()):
+            if not isinstance(value, pd.DataFrame):
+                continue
+            source = self._sources.get(value)
+            if source is None:
+                digest.update(f'|frame={frame_fingerprint(value)}'.encode())
+            elif source not in depends:
+                raise ValueError(f"Step '{name}' is passed the result of '{source}', "
+                                 f"which is missing from depends")
+        params = [arg for arg in args if not isinstance(arg, pd.DataFrame)]
+        params += sorted((k, v) for k, v in kwargs.items()
+                         if not isinstance(v, pd.DataFrame))
+        digest.update(repr(params).encode())
+        return digest.hexdigest()
+
+    def _path(self, name, key):
+        return os.path.join(self.cache_dir, f'{name}-{key[:20]}.pkl')
+
+    def _load(self, path):
+        """Read a cached result, or return (False, None) if unusable."""
+        try:
+            with open(path, 'rb') as f:
+                return True, pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return False, None
+
+    def _store(self, name, path, result):
+        """Write a result atomically and remove older results of the step."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        for old in glob.glob(os.path.join(glob.escape(self.cache_dir), f'{name}-*.pkl')):
+            if old != path:
+                os.remove(old)
+
+    def run(self, name, func, *args, depends=(), **kwargs):
+        """
+        Run a step, or load its result if nothing it depends on changed.
+
+        Args:
+            name (str): Step name, unique within the workflow.
+            func (callable): Function computing the step.
+            *args: Positional arguments for func.
+            depends (list): Names of the steps or inputs whose results are
+                passed in as DataFrame arguments (see StepCache.key).
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The step result.
+        """
+        key = self.key(name, func, args, kwargs, depends)
+        self.keys[name] = key
+        path = self._path(name, key)
+        if not self.force:
+            found, result = self._load(path)
+            if found:
+                self.reused.append(name)
+                return self._track(name, result)
+        result = func(*args, **kwargs)
+        self._store(name, path, result)
+        self.executed.append(name)
+        return self._track(name, result)
+
+    def _track(self, name, result):
+        """Remember which step produced a DataFrame result."""
+        if isinstance(result, pd.DataFrame):
+            self._sources.set(result, name)
+        return result
@@ -20,7 +20,12 @@ from geochemical_analyzer import (
     calculate_element_statistics,
     detect_anomalies,
     correlate_elements,
-    generate_summary_report
+    generate_summary_report,
+    calculate_multi_element_statistics,
+    correlation_matrix,
+    anomaly_masks,
+    anomaly_thresholds,
+    sweep_anomaly_thresholds
 )
 
 
@@ -184,6 +189,78 @@ class TestDetectAnomalies:
                 "Anomalies DataFrame should have same columns"
 
 
+class TestAnomalyMethods:
+    """Tests for the vectorized anomaly threshold modes."""
+
+    ELEMENTS = ['Au_ppm', 'Cu_pct', 'Fe_pct']
+
+    def test_std_masks_match_detect_anomalies(self, sample_dataframe):
+        """Test that 'std' masks flag the same rows as detect_anomalies."""
+        multipliers = [1.5, 2.0, 3.0]
+        masks = anomaly_masks(sample_dataframe, self.ELEMENTS, multipliers)
+
+        assert masks.shape == (len(sample_dataframe), 3, 3)
+        for i, element in enumerate(self.ELEMENTS):
+            for j, k in enumerate(multipliers):
+                expected = detect_anomalies(sample_dataframe, element, k)
+                assert list(sample_dataframe.index[masks[:, i, j]]) == \
+                    list(expected.index)
+
+    def test_mad_threshold_is_robust(self, sample_dataframe):
+        """Test that one extreme value barely moves the MAD threshold."""
+        spiked = sample_dataframe.copy()
+        spiked.loc[spiked.index[0], 'Au_ppm'] = 1e6
+
+        before = anomaly_thresholds(sample_dataframe, ['Au_ppm'], 3.0, 'mad')
+        after = anomaly_thresholds(spiked, ['Au_ppm'], 3.0, 'mad')
+        std_after = anomaly_thresholds(spiked, ['Au_ppm'], 3.0, 'std')
+
+        assert after.iloc[0, 0] == pytest.approx(before.iloc[0, 0], rel=0.1)
+        assert std_after.iloc[0, 0] > 1000
+
+    def test_log_and_percentile_modes(self, sample_dataframe):
+        """Test the log-space and percentile thresholds."""
+        values = sample_dataframe['Au_ppm']
+        logs = np.log10(values[values > 0])
+        log_threshold = anomaly_thresholds(sample_dataframe, ['Au_ppm'], 2.0, 'log')
+        assert log_threshold.iloc[0, 0] == pytest.approx(
+            10 ** (logs.mean() + 2.0 * logs.std()))
+
+        pct = anomaly_thresholds(sample_dataframe, ['Au_ppm'], [90.0], 'percentile')
+        assert pct.iloc[0, 0] == pytest.approx(values.quantile(0.9))
+
+        result = detect_anomalies(sample_dataframe, 'Au_ppm', 90.0, method='percentile')
+        assert all(result['Au_ppm'] > pct.iloc[0, 0])
+
+    def test_unknown_method(self, sample_dataframe):
+        """Test that an unknown method raises ValueError."""
+        with pytest.raises(ValueError):
+            anomaly_masks(sample_dataframe, ['Au_ppm'], 2.0, method='iqr')
+
+
+class TestThresholdSweep:
+    """Tests for the threshold sweep."""
+
+    def test_sweep_matches_detect_anomalies(self, sample_dataframe):
+        """Test counts and sample ids for every multiplier."""
+        multipliers = np.arange(0.5, 3.01, 0.5)
+        curve = sweep_anomaly_thresholds(sample_dataframe, 'Au_ppm', multipliers)
+
+        assert list(curve['multiplier']) == list(multipliers)
+        for _, row in curve.iterrows():
+            expected = detect_anomalies(sample_dataframe, 'Au_ppm', row['multiplier'])
+            assert row['anomaly_count'] == len(expected)
+            assert set(row['sample_ids']) == set(expected['sample_id'])
+
+    def test_counts_decrease_with_multiplier(self, sample_dataframe):
+        """Test that the curve is non-increasing for several elements."""
+        curve = sweep_anomaly_thresholds(sample_dataframe, ['Au_ppm', 'Cu_pct'],
+                                         [1.0, 2.0, 3.0], method='mad')
+
+        for _, group in curve.groupby('element'):
+            assert group['anomaly_count'].is_monotonic_decreasing
+
+
 class TestCorrelateElements:
     """Tests for the correlate_elements function."""
 
@@ -215,6 +292,34 @@ class TestCorrelateElements:
             "Correlation should be symmetric"
 
 
+class TestCorrelationMatrix:
+    """Tests for the batched correlation matrix."""
+
+    ELEMENTS = ['Au_ppm', 'Cu_pct', 'Ag_ppm', 'Fe_pct']
+
+    def test_matches_pairwise_correlations(self, sample_dataframe):
+        """Test every entry against correlate_elements."""
+        result = correlation_matrix(sample_dataframe, self.ELEMENTS)
+
+        for elem1 in self.ELEMENTS:
+            for elem2 in self.ELEMENTS:
+                expected = correlate_elements(sample_dataframe, elem1, elem2)
+                assert result.loc[elem1, elem2] == pytest.approx(expected)
+
+    def test_spearman_without_missing_values(self, sample_dataframe):
+        """Test the Spearman variant where no values are missing."""
+        elements = ['Fe_pct', 'S_pct']
+        result = correlation_matrix(sample_dataframe, elements, method='spearman')
+        expected = sample_dataframe[elements].corr(method='spearman')
+
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy())
+
+    def test_unknown_method(self, sample_dataframe):
+        """Test that an unknown method raises ValueError."""
+        with pytest.raises(ValueError):
+            correlation_matrix(sample_dataframe, self.ELEMENTS, method='kendall')
+
+
 class TestGenerateSummaryReport:
     """Tests for the generate_summary_report function."""
 
@@ -259,6 +364,33 @@ class TestGenerateSummaryReport:
             "Should include missing value information"
 
 
+class TestMultiElementStatistics:
+    """Tests for the single-pass multi-element statistics engine."""
+
+    def test_matches_per_element_functions(self, sample_dataframe):
+        """Test that the engine agrees with the per-element functions."""
+        elements = ['Au_ppm', 'Cu_pct', 'Ag_ppm', 'Fe_pct']
+        result = calculate_multi_element_statistics(sample_dataframe, elements, 2.0)
+
+        for element in elements:
+            stats = calculate_element_statistics(sample_dataframe, element)
+            for key in ['count', 'mean', 'std', 'min', 'max']:
+                assert result[element][key] == pytest.approx(stats[key])
+            assert result[element]['missing'] == \
+                sample_dataframe[element].isna().sum()
+            assert result[element]['anomaly_count'] == \
+                len(detect_anomalies(sample_dataframe, element, 2.0))
+
+    def test_all_missing_element(self, dataframe_with_all_missing):
+        """Test an element column that has no values at all."""
+        result = calculate_multi_element_statistics(dataframe_with_all_missing,
+                                                    ['Au_ppm'])
+
+        assert result['Au_ppm']['count'] == 0
+        assert result['Au_ppm']['missing'] == 3
+        assert result['Au_ppm']['anomaly_count'] == 0
+
+
 class TestDataIntegrity:
     """Tests for data integrity and edge cases."""
 
@@ -311,3 +443,126 @@ class TestVariantParameters:
         assert result is not None, \
             f"Should detect anomalies with threshold {anomaly_threshold}"
         assert isinstance(result, pd.DataFrame), "Should return DataFrame"
+
+
+class TestChunkedLoading:
+    """Tests for streaming assay data in chunks."""
+
+    @pytest.fixture
+    def chunked_csv(self, sample_dataframe, tmp_path):
+        """Write the sample data to a CSV file for chunked reading."""
+        path = tmp_path / "assays.csv"
+        sample_dataframe.to_csv(path, index=False)
+        return path
+
+    def test_chunks_have_requested_size_and_dtypes(self, chunked_csv):
+        """Test that chunks are bounded in size and consistently typed."""
+        chunks = list(load_assay_data(str(chunked_csv), chunksize=7))
+
+        assert all(len(chunk) <= 7 for chunk in chunks)
+        assert all(chunk['from_depth'].dtype == np.float64 for chunk in chunks)
+        assert all(chunk['Au_ppm'].dtype == np.float64 for chunk in chunks)
+
+    def test_chunked_statistics_match_full_frame(self, chunked_csv):
+        """Test that chunked statistics equal whole-frame statistics."""
+        df = load_assay_data(str(chunked_csv))
+        chunks = load_assay_data(str(chunked_csv), chunksize=7)
+
+        expected = calculate_element_statistics(df, 'Au_ppm')
+        result = calculate_element_statistics(chunks, 'Au_ppm', quantiles='exact')
+
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value)
+
+    def test_chunked_quartiles_use_sketch(self, chunked_csv):
+        """Test that chunked quartiles are close to the exact quartiles."""
+        df = load_assay_data(str(chunked_csv))
+        chunks = load_assay_data(str(chunked_csv), chunksize=7)
+
+        result = calculate_element_statistics(chunks, 'Au_ppm')
+        values = np.sort(df['Au_ppm'].dropna().to_numpy())
+
+        for key, q in [('25%', 0.25), ('50%', 0.5), ('75%', 0.75)]:
+            rank = np.searchsorted(values, result[key]) / len(values)
+            assert abs(rank - q) < 0.03
+
+    def test_chunked_anomalies_and_report(self, chunked_csv):
+        """Test anomaly detection and summary report on a chunk stream."""
+        df = load_assay_data(str(chunked_csv))
+        chunks = load_assay_data(str(chunked_csv), chunksize=7)
+
+        anomalies = detect_anomalies(chunks, 'Au_ppm', 1.5)
+        expected = detect_anomalies(df, 'Au_ppm', 1.5)
+        assert list(anomalies['sample_id']) == list(expected['sample_id'])
+
+        report = generate_summary_report(chunks, ['Au_ppm', 'Cu_pct'])
+        expected_report = generate_summary_report(df, ['Au_ppm', 'Cu_pct'])
+        for element, stats in expected_report.items():
+            for key, value in stats.items():
+                assert report[element][key] == pytest.approx(value)
+
+
+class TestLoadPushdown:
+    """Tests for column projection and row predicates in load_assay_data."""
+
+    WHERE = {'sample_quality': 'Good', 'from_depth': (50, None), 'to_depth': (None, 250)}
+
+    @pytest.fixture
+    def assay_csv(self, sample_dataframe, tmp_path):
+        """Write the sample data to a CSV file."""
+        path = tmp_path / "assays.csv"
+        sample_dataframe.to_csv(path, index=False)
+        return str(path)
+
+    def expected(self, assay_csv, columns):
+        df = load_assay_data(assay_csv)
+        mask = ((df['sample_quality'] == 'Good') & (df['from_depth'] >= 50)
+                & (df['to_depth'] <= 250))
+        return df.loc[mask, columns]
+
+    @pytest.mark.parametrize("cache", [False, True])
+    def test_matches_filtered_frame(self, assay_csv, cache):
+        """Test that pushed-down loading equals filtering the full frame."""
+        if cache:
+            pytest.importorskip("pyarrow")
+        columns = ['hole_id', 'Au_ppm']
+        result = load_assay_data(assay_csv, columns=columns, where=self.WHERE, cache=cache)
+        pd.testing.assert_frame_equal(result, self.expected(assay_csv, columns))
+
+    def test_chunks_are_filtered_and_projected(self, assay_csv):
+        """Test that each chunk only holds matching rows and requested columns."""
+        chunks = list(load_assay_data(assay_csv, chunksize=40, columns=['Au_ppm'],
+                                      where=self.WHERE))
+        assert all(list(chunk.columns) == ['Au_ppm'] for chunk in chunks)
+        result = pd.concat(chunks)
+        pd.testing.assert_frame_equal(result, self.expected(assay_csv, ['Au_ppm']))
+
+    def test_membership_and_no_match(self, assay_csv):
+        """Test list conditions and a predicate that matches nothing."""
+        df = load_assay_data(assay_csv, where={'sample_quality': ['Good', 'Fair']})
+        assert set(df['sample_quality']) <= {'Good', 'Fair'}
+        assert isinstance(df['hole_id'].dtype, pd.CategoricalDtype)
+
+        empty = load_assay_data(assay_csv, columns=['sample_id', 'Au_ppm'],
+                                where={'sample_quality': 'Unknown'})
+        assert len(empty) == 0
+        assert list(empty.columns) == ['sample_id', 'Au_ppm']
+
+    @pytest.mark.parametrize("options", [{}, {'where': {'sample_quality': 'Good'}},
+                                         {'cache': True}, {'chunksize': 40}])
+    def test_columns_in_requested_order(self, assay_csv, options):
+        """Test that every loading path returns columns in the order asked for."""
+        if options.get('cache'):
+            pytest.importorskip("pyarrow")
+        result = load_assay_data(assay_csv, columns=['Au_ppm', 'hole_id'], **options)
+        if 'chunksize' in options:
+            result = pd.concat(list(result))
+        assert list(result.columns) == ['Au_ppm', 'hole_id']
+
+    @pytest.mark.parametrize("options", [{'columns': ['Au_ppm', 'Pt_ppm']},
+                                         {'where': {'Pt_ppm': (0, None)}},
+                                         {'columns': ['Pt_ppm'], 'chunksize': 40}])
+    def test_unknown_columns_raise(self, assay_csv, options):
+        """Test that unknown names in columns or where raise the same error."""
+        with pytest.raises(ValueError, match='Pt_ppm'):
+            load_assay_data(assay_csv, **options)
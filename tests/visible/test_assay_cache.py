@@ -0,0 +1,88 @@
+"""
+Visible tests for the assay cache module.
+"""
+
+import os
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+pytest.importorskip("pyarrow")
+
+import assay_cache
+from assay_cache import (
+    cache_paths,
+    file_fingerprint,
+    is_cache_valid,
+    load_cached_assay_data,
+    source_hash,
+)
+from geochemical_analyzer import load_assay_data
+
+
+@pytest.fixture
+def csv_path(sample_dataframe, tmp_path):
+    """Write the sample data to a CSV file."""
+    path = tmp_path / "assays.csv"
+    sample_dataframe.to_csv(path, index=False)
+    return str(path)
+
+
+class TestAssayCache:
+    """Tests for the columnar sidecar cache."""
+
+    @pytest.mark.parametrize("format", ["parquet", "feather"])
+    def test_cache_matches_csv(self, csv_path, format):
+        """Test that cached loads return the same data as the CSV."""
+        expected = load_assay_data(csv_path)
+
+        first = load_cached_assay_data(csv_path, format=format)
+        assert is_cache_valid(csv_path, format=format)
+        second = load_cached_assay_data(csv_path, format=format)
+
+        pd.testing.assert_frame_equal(first, expected)
+        pd.testing.assert_frame_equal(second, expected)
+
+    def test_column_projection(self, csv_path):
+        """Test that only the requested columns are returned."""
+        load_cached_assay_data(csv_path)
+        df = load_cached_assay_data(csv_path, columns=['hole_id', 'Au_ppm'])
+
+        assert list(df.columns) == ['hole_id', 'Au_ppm']
+
+    def test_rebuilds_when_csv_changes(self, csv_path, sample_dataframe):
+        """Test that the cache is rebuilt after the CSV is modified."""
+        load_cached_assay_data(csv_path)
+        sample_dataframe.iloc[:5].to_csv(csv_path, index=False)
+
+        assert not is_cache_valid(csv_path)
+        assert len(load_cached_assay_data(csv_path)) == 5
+
+    def test_touched_file_keeps_cache(self, csv_path):
+        """Test that a changed mtime with unchanged content reuses the cache."""
+        load_cached_assay_data(csv_path)
+        data_path, _ = cache_paths(csv_path)
+        built = os.stat(data_path).st_mtime_ns
+        stat = os.stat(csv_path)
+        os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+        assert is_cache_valid(csv_path)
+        assert os.stat(data_path).st_mtime_ns == built
+
+    def test_source_hash_reuses_sidecar_key(self, csv_path, monkeypatch):
+        """Test that an unchanged source is not hashed again."""
+        expected = file_fingerprint(csv_path)['sha256']
+        load_cached_assay_data(csv_path)
+        monkeypatch.setattr(assay_cache, 'file_fingerprint',
+                            lambda filename: pytest.fail("source was rehashed"))
+
+        assert source_hash(csv_path) == expected
+
+    def test_source_hash_without_cache(self, csv_path):
+        """Test that the file is hashed when there is no valid sidecar."""
+        assert source_hash(csv_path) == file_fingerprint(csv_path)['sha256']
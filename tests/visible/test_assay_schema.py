@@ -0,0 +1,78 @@
+"""
+Visible tests for the assay schema module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from assay_schema import DATE_DTYPE, apply_assay_schema, memory_savings
+from geochemical_analyzer import load_assay_data, filter_by_quality
+
+
+class TestAssaySchema:
+    """Tests for the compact assay dtypes."""
+
+    def test_loader_uses_compact_schema(self, sample_dataframe, tmp_path):
+        """Test that loaded frames use categoricals and parsed dates."""
+        path = tmp_path / "assays.csv"
+        sample_dataframe.to_csv(path, index=False)
+
+        df = load_assay_data(str(path), float32=True)
+
+        for column in ['hole_id', 'lithology', 'sample_quality']:
+            assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        assert pd.api.types.is_datetime64_any_dtype(df['assay_date'])
+        assert df['Au_ppm'].dtype == np.float32
+        assert df['from_depth'].dtype == np.float64
+
+    @pytest.mark.parametrize("options", [{}, {'chunksize': 7}, {'cache': True}])
+    def test_bad_cells_become_missing(self, sample_dataframe, tmp_path, options):
+        """Test that non-numeric grades and bad dates do not fail the load."""
+        raw = sample_dataframe.astype({'Au_ppm': object, 'assay_date': object})
+        raw.loc[3, 'Au_ppm'] = '<0.01'
+        raw.loc[5, 'assay_date'] = 'pending'
+        path = tmp_path / "assays.csv"
+        raw.to_csv(path, index=False)
+
+        df = load_assay_data(str(path), **options)
+        if 'chunksize' in options:
+            df = pd.concat(list(df))
+
+        assert df['Au_ppm'].dtype == np.float64 and np.isnan(df['Au_ppm'].iloc[3])
+        assert df['assay_date'].dtype == DATE_DTYPE and pd.isna(df['assay_date'].iloc[5])
+        assert df['Au_ppm'].drop(index=3).equals(sample_dataframe['Au_ppm'].drop(index=3))
+
+    def test_apply_schema_coerces_bad_cells(self, sample_dataframe):
+        """Test that apply_assay_schema gives the same dtypes for messy frames."""
+        raw = sample_dataframe.astype({'Cu_pct': object})
+        raw.loc[0, 'Cu_pct'] = 'n/a'
+
+        compact = apply_assay_schema(raw, float32=True)
+
+        assert compact['Cu_pct'].dtype == np.float32 and np.isnan(compact['Cu_pct'].iloc[0])
+        assert compact['assay_date'].dtype == DATE_DTYPE
+
+    def test_apply_schema_preserves_values(self, sample_dataframe):
+        """Test that conversion keeps the data itself unchanged."""
+        compact = apply_assay_schema(sample_dataframe)
+
+        assert list(compact.columns) == list(sample_dataframe.columns)
+        assert (compact['lithology'].astype(str)
+                == sample_dataframe['lithology'].astype(str)).all()
+        assert len(filter_by_quality(compact, 'Good')) == \
+            len(filter_by_quality(sample_dataframe, 'Good'))
+
+    def test_memory_savings_report(self, sample_dataframe):
+        """Test that the memory report covers every column plus a total."""
+        report = memory_savings(sample_dataframe,
+                                apply_assay_schema(sample_dataframe, float32=True))
+
+        assert list(report.index) == list(sample_dataframe.columns) + ['total']
+        assert report.loc['Au_ppm', 'saved_bytes'] > 0
+        assert report.loc['total', 'saved_bytes'] == report['saved_bytes'].iloc[:-1].sum()
@@ -0,0 +1,385 @@
+"""
+Visible tests for the data cleaning module.
+"""
+
+import gc
+import weakref
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import data_cleaning
+from assay_schema import apply_assay_schema
+from data_cleaning import (
+    find_interval_conflicts,
+    handle_missing_values,
+    merge_adjacent_samples,
+    outlier_rejections,
+    remove_outliers,
+    validate_data_quality,
+)
+
+
+class TestRemoveOutliers:
+    """Tests for the remove_outliers function."""
+
+    def test_iqr_bounds(self, sample_dataframe):
+        """Test that IQR filtering keeps only values inside the fences."""
+        result = remove_outliers(sample_dataframe, 'Au_ppm', method='iqr')
+
+        q1, q3 = sample_dataframe['Au_ppm'].quantile([0.25, 0.75])
+        iqr = q3 - q1
+        assert result['Au_ppm'].between(q1 - 1.5 * iqr, q3 + 1.5 * iqr).all()
+        assert len(result) < len(sample_dataframe)
+
+    def test_zscore_method(self, sample_dataframe):
+        """Test that z-score filtering removes extreme values."""
+        result = remove_outliers(sample_dataframe, 'Au_ppm', method='zscore',
+                                 threshold=2.0)
+
+        mean_val = sample_dataframe['Au_ppm'].mean()
+        std_val = sample_dataframe['Au_ppm'].std()
+        assert (abs(result['Au_ppm'] - mean_val) <= 2.0 * std_val).all()
+
+    def test_sketch_quantiles_close_to_exact(self, sample_dataframe):
+        """Test that sketch-based IQR filtering matches exact filtering closely."""
+        exact = remove_outliers(sample_dataframe, 'Au_ppm', quantiles='exact')
+        sketch = remove_outliers(sample_dataframe, 'Au_ppm', quantiles='sketch')
+
+        assert abs(len(exact) - len(sketch)) <= 0.03 * len(sample_dataframe)
+
+    def test_unknown_method(self, sample_dataframe):
+        """Test that an unknown method raises ValueError."""
+        with pytest.raises(ValueError):
+            remove_outliers(sample_dataframe, 'Au_ppm', method='magic')
+
+    @pytest.mark.parametrize("method", ['iqr', 'zscore'])
+    def test_several_elements_match_single(self, sample_dataframe, method):
+        """Test that batched bounds give the same per-element rejections."""
+        elements = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
+        rejected = {element: ~sample_dataframe.index.isin(
+                        remove_outliers(sample_dataframe, element, method=method).index)
+                    for element in elements}
+
+        any_result = remove_outliers(sample_dataframe, elements, method=method)
+        all_result = remove_outliers(sample_dataframe, elements, method=method,
+                                     rule='all')
+        matrix = outlier_rejections(sample_dataframe, elements, method=method)
+
+        assert isinstance(any_result, pd.DataFrame)
+        for j, element in enumerate(elements):
+            assert np.array_equal(matrix[:, j], rejected[element])
+        index = sample_dataframe.index
+        assert list(any_result.index) == list(index[~matrix.any(axis=1)])
+        assert list(all_result.index) == list(index[~matrix.all(axis=1)])
+
+    def test_unknown_rule(self, sample_dataframe):
+        """Test that an unknown combination rule raises ValueError."""
+        with pytest.raises(ValueError):
+            remove_outliers(sample_dataframe, ['Au_ppm', 'Cu_pct'], rule='most')
+
+
+class TestHandleMissingValues:
+    """Tests for the group, inplace and downhole options of handle_missing_values."""
+
+    @pytest.mark.parametrize("by", ['hole_id', 'lithology', ['hole_id', 'lithology']])
+    @pytest.mark.parametrize("strategy", ['mean', 'median'])
+    def test_group_fill_matches_transform(self, sample_dataframe, strategy, by):
+        """Test that group fills match a groupby transform per column."""
+        columns = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
+        result = handle_missing_values(sample_dataframe, strategy, columns, by=by)
+
+        group_stats = sample_dataframe.groupby(by)[columns].transform(strategy)
+        expected = sample_dataframe.fillna(group_stats)
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_inplace_replaces_only_filled_columns(self, sample_dataframe):
+        """Test that inplace filling leaves the other columns untouched."""
+        df = sample_dataframe.copy()
+        depths = df['from_depth'].to_numpy()
+        expected = handle_missing_values(df, 'median', by='hole_id')
+
+        assert handle_missing_values(df, 'median', by='hole_id', inplace=True) is None
+        pd.testing.assert_frame_equal(df, expected)
+        assert np.shares_memory(df['from_depth'].to_numpy(), depths)
+
+    def test_group_fill_needs_mean_or_median(self, sample_dataframe):
+        """Test that by is rejected for strategies without a group statistic."""
+        with pytest.raises(ValueError):
+            handle_missing_values(sample_dataframe, 'zero', by='hole_id')
+
+    @pytest.mark.parametrize("interpolation", ['linear', 'nearest'])
+    def test_downhole_matches_per_hole_interp(self, interpolation):
+        """Test downhole fills against a per-hole interpolation on midpoints."""
+        rng = np.random.default_rng(3)
+        lengths = rng.uniform(0.5, 3.0, 90)
+        hole_ids = np.repeat(['DH-01', 'DH-02', 'DH-03'], 30)
+        to_depth = pd.Series(lengths).groupby(hole_ids).cumsum().to_numpy()
+        df = pd.DataFrame({
+            'hole_id': hole_ids,
+            'from_depth': to_depth - lengths,
+            'to_depth': to_depth,
+            'Au_ppm': np.where(rng.random(90) < 0.3, np.nan, rng.random(90)),
+            'Cu_pct': np.where(rng.random(90) < 0.3, np.nan, rng.random(90)),
+        }).sample(frac=1, random_state=0)
+        columns = ['Au_ppm', 'Cu_pct']
+        result = handle_missing_values(df, 'downhole', columns,
+                                       interpolation=interpolation)
+
+        for _, hole in df.groupby('hole_id'):
+            hole = hole.sort_values(['from_depth', 'to_depth'])
+            middle = ((hole['from_depth'] + hole['to_depth']) / 2).to_numpy()
+            for column in columns:
+                values = hole[column].to_numpy()
+                known = ~np.isnan(values)
+                if interpolation == 'linear':
+                    expected = np.interp(middle, middle[known], values[known])
+                else:
+                    # Distance to each known sample; ties go to the shallower one
+                    distance = np.abs(middle[:, None] - middle[known][None, :])
+                    expected = values[known][distance.argmin(axis=1)]
+                assert np.allclose(result.loc[hole.index, column], expected)
+
+    def test_downhole_max_gap(self):
+        """Test that neighbours beyond max_gap are not used."""
+        df = pd.DataFrame({
+            'hole_id': ['DH-01'] * 4 + ['DH-02'],
+            'from_depth': [0.0, 1.0, 2.0, 10.0, 1.0],
+            'to_depth': [1.0, 2.0, 3.0, 11.0, 2.0],
+            'Au_ppm': [1.0, np.nan, 3.0, np.nan, np.nan],
+        })
+
+        result = handle_missing_values(df, 'downhole', ['Au_ppm'], max_gap=2.0)
+
+        # The last DH-01 sample is 8 m from any assay; DH-02 has none at all
+        assert result['Au_ppm'].tolist()[:3] == [1.0, 2.0, 3.0]
+        assert result['Au_ppm'].iloc[3:].isna().all()
+
+
+@pytest.fixture
+def dirty_dataframe(sample_dataframe):
+    """Sample data with a duplicate ID, an inverted interval and a negative grade."""
+    df = sample_dataframe.copy()
+    df.loc[5, 'sample_id'] = df.loc[7, 'sample_id']
+    df.loc[9, 'from_depth'] = df.loc[9, 'to_depth'] + 1
+    df.loc[11, 'Cu_pct'] = -0.5
+    return df
+
+
+def reference_report(df):
+    """The checks done with separate pandas scans."""
+    negative = (df.select_dtypes('number') < 0).sum()
+    return {
+        'total_rows': len(df),
+        'missing_values': df.isna().sum().to_dict(),
+        'duplicate_ids': list(df.loc[df['sample_id'].duplicated(), 'sample_id'].unique()),
+        'negative_values': negative[negative > 0].to_dict(),
+        'invalid_depths': int((df['from_depth'] >= df['to_depth']).sum()),
+        'rejected_samples': int((df['sample_quality'] == 'Rejected').sum()),
+    }
+
+
+class TestValidateDataQuality:
+    """Tests for the single-pass validation engine."""
+
+    def test_matches_pandas_checks(self, dirty_dataframe):
+        """Test every check against separate pandas scans."""
+        report = validate_data_quality(dirty_dataframe)
+        expected = reference_report(dirty_dataframe)
+        for key, value in expected.items():
+            assert report[key] == value, key
+        assert report['issues_found']
+
+    def test_chunks_and_categoricals_agree(self, dirty_dataframe):
+        """Test that chunked and compact-schema input give the same report."""
+        expected = validate_data_quality(dirty_dataframe)
+        compact = apply_assay_schema(dirty_dataframe)
+        chunks = (compact.iloc[i:i + 64] for i in range(0, len(compact), 64))
+        report = validate_data_quality(chunks)
+        for key in ('missing_values', 'duplicate_ids', 'negative_values',
+                    'invalid_depths', 'rejected_samples'):
+            assert report[key] == expected[key], key
+
+    def test_hash_collisions_are_verified(self, dirty_dataframe, monkeypatch):
+        """Test that colliding hashes do not produce false duplicates."""
+        monkeypatch.setattr(data_cleaning, '_hash_ids',
+                            lambda ids: np.zeros(len(ids), dtype=np.uint64))
+        chunks = [dirty_dataframe.iloc[:100], dirty_dataframe.iloc[100:]]
+        report = validate_data_quality(chunks)
+        assert report['duplicate_ids'] == [dirty_dataframe.loc[7, 'sample_id']]
+
+    def test_seen_hashes_match_duplicated(self):
+        """Test that the hash set flags the same rows as Series.duplicated."""
+        hashes = np.random.default_rng(0).integers(0, 50, 1000).astype(np.uint64)
+        seen = data_cleaning._SeenHashes()
+        again = np.concatenate([seen.add(batch)
+                                for batch in np.split(hashes, [1, 100, 400, 400, 1000])])
+
+        assert again.tolist() == pd.Series(hashes).duplicated().tolist()
+
+    def test_stream_chunks_are_released(self, dirty_dataframe):
+        """Test that a one-shot stream is not buffered while validating."""
+        released = []
+
+        def stream():
+            refs = []
+            for start in range(0, len(dirty_dataframe), 50):
+                if len(refs) >= 2:
+                    gc.collect()
+                    released.append(refs[-2]() is None)
+                chunk = dirty_dataframe.iloc[start:start + 50].copy()
+                refs.append(weakref.ref(chunk))
+                yield chunk
+
+        report = validate_data_quality(stream())
+        assert released and all(released)
+        assert report['duplicate_ids'] == [dirty_dataframe.loc[7, 'sample_id']]
+
+    def test_timings_reported(self, sample_dataframe):
+        """Test that each check reports its time and throughput."""
+        timings = validate_data_quality(sample_dataframe)['timings']
+        assert set(timings) == set(data_cleaning.VALIDATION_CHECKS)
+        for timing in timings.values():
+            assert timing['seconds'] >= 0 and timing['rows_per_sec'] >= 0
+
+
+class TestFindIntervalConflicts:
+    """Tests for overlap and gap detection within holes."""
+
+    def test_overlaps_and_gaps(self):
+        """Test that non-adjacent overlaps and gaps after long intervals are found."""
+        df = pd.DataFrame({
+            'sample_id': ['A', 'B', 'C', 'D', 'E', 'F', 'G'],
+            'hole_id': ['DH-01', 'DH-01', 'DH-01', 'DH-01', 'DH-02', 'DH-02', 'DH-01'],
+            'from_depth': [0.0, 1.0, 3.0, 3.5, 0.0, 0.0, 10.0],
+            'to_depth': [1.0, 3.0, 6.0, 4.0, 2.0, 2.0, 12.0],
+        })
+
+        result = find_interval_conflicts(df)
+
+        rows = [tuple(row) for row in result[['hole_id', 'kind', 'upper_sample_id',
+                                              'lower_sample_id', 'length']].to_numpy()]
+        # D lies inside C, so the gap to G starts at C's to_depth
+        assert rows == [('DH-01', 'overlap', 'C', 'D', 0.5),
+                        ('DH-01', 'gap', 'C', 'G', 4.0),
+                        ('DH-02', 'overlap', 'E', 'F', 2.0)]
+
+    def test_tolerance(self):
+        """Test that conflicts within the tolerance are ignored."""
+        df = pd.DataFrame({
+            'sample_id': ['A', 'B', 'C'],
+            'hole_id': ['DH-01'] * 3,
+            'from_depth': [0.0, 0.99, 2.01],
+            'to_depth': [1.0, 2.0, 3.0],
+        })
+
+        assert len(find_interval_conflicts(df)) == 2
+        assert len(find_interval_conflicts(df, tolerance=0.05)) == 0
+
+    def test_tolerance_applies_to_overlap_length(self):
+        """Test that a contained interval overlapping by little is ignored."""
+        df = pd.DataFrame({
+            'sample_id': ['A', 'B', 'C'],
+            'hole_id': ['DH-01'] * 3,
+            'from_depth': [0.0, 1.98, 5.0],
+            'to_depth': [5.0, 1.99, 6.0],
+        })
+
+        result = find_interval_conflicts(df, tolerance=0.05)
+
+        assert len(result) == 0
+        assert len(find_interval_conflicts(df)) == 1
+
+    def test_matches_pairwise_check(self, sample_dataframe):
+        """Test that every overlapping pair is reported, as a pairwise scan finds."""
+        df = sample_dataframe.copy()
+        df['to_depth'] = df['to_depth'] + np.resize([0.0, 0.0, 3.0, 12.0], len(df))
+
+        result = find_interval_conflicts(df)
+
+        expected = set()
+        for _, hole in df.groupby('hole_id'):
+            hole = hole.sort_values(['from_depth', 'to_depth'])
+            rows = list(hole.itertuples())
+            for i, upper in enumerate(rows):
+                for lower in rows[i + 1:]:
+                    if lower.from_depth < upper.to_depth:
+                        expected.add((upper.sample_id, lower.sample_id))
+        overlaps = result[result['kind'] == 'overlap']
+        assert set(zip(overlaps['upper_sample_id'], overlaps['lower_sample_id'])) == expected
+        assert (result['length'] > 0).all()
+
+
+@pytest.fixture
+def interval_dataframe():
+    """Return two short holes with a gap and a missing grade."""
+    return pd.DataFrame({
+        'hole_id': ['DH-01', 'DH-01', 'DH-01', 'DH-02', 'DH-01'],
+        'from_depth': [0.0, 1.0, 3.5, 0.0, 5.0],
+        'to_depth': [1.0, 3.0, 5.0, 3.0, 6.0],
+        'Au_ppm': [1.0, 2.0, 4.0, 3.0, np.nan],
+        'Cu_pct': [0.1, 0.2, 0.4, 0.3, 0.5],
+    })
+
+
+class TestMergeAdjacentSamples:
+    """Tests for the compositing engine."""
+
+    def test_run_merging(self, interval_dataframe):
+        """Test that runs split at gaps larger than max_gap."""
+        result = merge_adjacent_samples(interval_dataframe, ['Au_ppm', 'Cu_pct'],
+                                        max_gap=0.25)
+
+        assert list(result['hole_id']) == ['DH-01', 'DH-01', 'DH-02']
+        assert list(result['n_samples']) == [2, 2, 1]
+        # Length-weighted: (1*1 + 2*2) / 3
+        assert result['Au_ppm'].iloc[0] == pytest.approx(5 / 3)
+        # Missing Au in the last sample is excluded from the weights
+        assert result['Au_ppm'].iloc[1] == pytest.approx(4.0)
+        assert result['Cu_pct'].iloc[1] == pytest.approx((0.4 * 1.5 + 0.5) / 2.5)
+
+    def test_fixed_length_splits_samples(self, interval_dataframe):
+        """Test that fixed-length compositing splits straddling samples."""
+        result = merge_adjacent_samples(interval_dataframe, 'Au_ppm',
+                                        composite_length=2.0)
+        hole = result[result['hole_id'] == 'DH-01']
+
+        assert list(hole['from_depth']) == [0.0, 2.0, 4.0]
+        assert list(hole['to_depth']) == [2.0, 4.0, 6.0]
+        assert list(hole['length']) == [2.0, 1.5, 2.0]
+        assert hole['Au_ppm'].iloc[1] == pytest.approx((2.0 * 1 + 4.0 * 0.5) / 1.5)
+
+    def test_fixed_length_bin_edges_with_rounding(self):
+        """Test that depths like 0.1 and 0.3 do not create sliver composites."""
+        df = pd.DataFrame({
+            'hole_id': ['DH-01'] * 3 + ['DH-02'],
+            'from_depth': [0.1, 0.4, 0.7, 0.1],
+            'to_depth': [0.4, 0.7, 1.0, 0.8],
+            'Au_ppm': [1.0, 2.0, 3.0, 4.0],
+        })
+
+        thirds = merge_adjacent_samples(df[df['hole_id'] == 'DH-01'], 'Au_ppm',
+                                        composite_length=0.3)
+        single = merge_adjacent_samples(df[df['hole_id'] == 'DH-02'], 'Au_ppm',
+                                        composite_length=0.7)
+
+        assert list(thirds['n_samples']) == [1, 1, 1]
+        assert list(thirds['Au_ppm']) == [1.0, 2.0, 3.0]
+        assert thirds['length'].to_numpy() == pytest.approx([0.3, 0.3, 0.3])
+        assert len(single) == 1 and single['length'].iloc[0] == pytest.approx(0.7)
+
+    def test_matches_per_hole_weighted_mean(self, sample_dataframe):
+        """Test that one run per hole reproduces the interval-weighted mean."""
+        from geochemical_analyzer import calculate_interval_weighted_mean
+
+        result = merge_adjacent_samples(sample_dataframe, 'Cu_pct', max_gap=1e9)
+
+        for _, row in result.iterrows():
+            group = sample_dataframe[sample_dataframe['hole_id'] == row['hole_id']]
+            assert row['Cu_pct'] == pytest.approx(
+                calculate_interval_weighted_mean(group, 'Cu_pct'))
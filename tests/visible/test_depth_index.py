@@ -0,0 +1,81 @@
+"""
+Visible tests for the depth interval index.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from data_cleaning import filter_by_depth_range
+from depth_index import get_depth_index, sort_by_hole_depth
+
+
+WINDOWS = [(None, None), (20, 60), (None, 30), (70, None), (41, 42), (-10, 1000)]
+
+
+class TestDepthIndex:
+    """Tests for depth-range queries through the per-hole index."""
+
+    @pytest.mark.parametrize("top,bottom", WINDOWS)
+    def test_overlap_matches_mask(self, sample_dataframe, top, bottom):
+        """Test overlap queries against a full boolean scan."""
+        df = sample_dataframe.copy()
+        upper = -np.inf if top is None else top
+        lower = np.inf if bottom is None else bottom
+        mask = (df['from_depth'] < lower) & (df['to_depth'] > upper)
+
+        rows = get_depth_index(df).overlapping(top, bottom)
+        assert list(rows) == list(np.flatnonzero(mask.to_numpy()))
+
+        hole = df['hole_id'].iloc[0]
+        rows = get_depth_index(df).overlapping(top, bottom, hole_id=hole)
+        expected = np.flatnonzero((mask & (df['hole_id'] == hole)).to_numpy())
+        assert list(rows) == list(expected)
+
+    @pytest.mark.parametrize("top,bottom", WINDOWS)
+    def test_filter_with_index_matches_scan(self, sample_dataframe, top, bottom):
+        """Test that indexed depth filtering returns the same rows."""
+        expected = filter_by_depth_range(sample_dataframe, top, bottom)
+        result = filter_by_depth_range(sample_dataframe, top, bottom, use_index=True)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_index_cached_and_invalidated(self, sample_dataframe):
+        """Test that the index is reused until the frame changes."""
+        df = sample_dataframe.copy()
+        index = get_depth_index(df)
+        assert get_depth_index(df) is index
+
+        df.loc[df.index[0], 'to_depth'] = 10_000
+        rebuilt = get_depth_index(df)
+        assert rebuilt is not index
+        assert 0 in rebuilt.overlapping(5_000, 6_000)
+
+    def test_unknown_hole(self, sample_dataframe):
+        """Test that querying a hole that does not exist returns nothing."""
+        rows = get_depth_index(sample_dataframe).within(hole_id='NO-SUCH-HOLE')
+
+        assert len(rows) == 0
+
+
+def test_sort_matches_lexsort():
+    """Test that sort_by_hole_depth orders rows like a three-key lexsort."""
+    rng = np.random.default_rng(7)
+    df = pd.DataFrame({
+        'hole_id': rng.choice(['DH-01', 'DH-02', None], 2000),
+        'from_depth': np.round(rng.random(2000) * 50),
+        'to_depth': np.round(rng.random(2000) * 50),
+    })
+
+    order, _, _, _ = sort_by_hole_depth(df)
+
+    codes, _ = pd.factorize(df['hole_id'], sort=True)
+    valid = np.flatnonzero(codes >= 0)
+    expected = valid[np.lexsort((df['to_depth'].to_numpy()[valid],
+                                 df['from_depth'].to_numpy()[valid], codes[valid]))]
+    assert np.array_equal(order, expected)
@@ -0,0 +1,39 @@
+"""
+Visible tests for the per-DataFrame cache.
+"""
+
+import gc
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from frame_cache import FrameCache, same_storage
+
+
+def test_frame_cache_drops_collected_frames():
+    """Test that FrameCache entries are per key and go away with the frame."""
+    cache = FrameCache()
+    df = pd.DataFrame({'a': [1, 2]})
+    cache.set(df, 'plain')
+    cache.set(df, 'keyed', key='a')
+
+    assert cache.get(df) == 'plain' and cache.get(df, 'a') == 'keyed'
+    assert cache.get(pd.DataFrame({'a': [1, 2]})) is None
+    del df
+    gc.collect()
+    assert len(cache) == 0
+
+
+def test_same_storage_follows_column_changes():
+    """Test that a replaced column no longer shares storage with the held one."""
+    df = pd.DataFrame({'a': [1.0, 2.0], 'b': ['x', 'y']})
+    held_a, held_b = df['a'], df['b']
+    assert same_storage(held_a, df['a']) and same_storage(held_b, df['b'])
+
+    df['a'] = [3.0, 4.0]
+    df['b'] = ['x', 'z']
+    assert not same_storage(held_a, df['a'])
+    assert not same_storage(held_b, df['b'])
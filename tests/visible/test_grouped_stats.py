@@ -0,0 +1,81 @@
+"""
+Visible tests for the grouped statistics engine.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import grouped_stats
+from assay_schema import apply_assay_schema
+from geochemical_analyzer import get_element_by_hole, get_element_by_lithology
+from grouped_stats import get_group_index, grouped_statistics
+
+
+ELEMENTS = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
+
+
+class TestGroupedStatistics:
+    """Tests for grouped_statistics against pandas groupby().describe()."""
+
+    @pytest.mark.parametrize("by", ['lithology', 'hole_id', ['hole_id', 'lithology']])
+    @pytest.mark.parametrize("segment_sort", [True, False])
+    def test_matches_describe(self, sample_dataframe, monkeypatch, by, segment_sort):
+        """Test every statistic for plain and categorical keys, both sort paths."""
+        if not segment_sort:
+            monkeypatch.setattr(grouped_stats, 'SEGMENT_SORT_MIN_SIZE', 10 ** 9)
+        for df in (sample_dataframe, apply_assay_schema(sample_dataframe)):
+            result = grouped_statistics(df, by, ELEMENTS)
+            expected = df.groupby(by, observed=True)[ELEMENTS].describe()
+            pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_all_missing_group(self, sample_dataframe):
+        """Test a group whose values are all missing."""
+        df = sample_dataframe.copy()
+        hole = df['hole_id'].iloc[0]
+        df.loc[df['hole_id'] == hole, 'Au_ppm'] = np.nan
+        stats = grouped_statistics(df, 'hole_id', ['Au_ppm'])['Au_ppm'].loc[hole]
+        assert stats['count'] == 0
+        assert stats[['mean', 'std', 'min', '50%', 'max']].isna().all()
+
+    def test_stat_subset_and_unknown(self, sample_dataframe):
+        """Test requesting a subset of statistics."""
+        result = grouped_statistics(sample_dataframe, 'hole_id', ['Au_ppm'],
+                                    stats=['mean', 'count'])
+        assert list(result.columns) == [('Au_ppm', 'mean'), ('Au_ppm', 'count')]
+        with pytest.raises(ValueError):
+            grouped_statistics(sample_dataframe, 'hole_id', ['Au_ppm'], stats=['mode'])
+
+    def test_count_and_mean_match_full_path(self, sample_dataframe):
+        """Test that the count/mean shortcut agrees with the segment reductions."""
+        full = grouped_statistics(sample_dataframe, 'lithology', ELEMENTS)
+        short = grouped_statistics(sample_dataframe, 'lithology', ELEMENTS,
+                                   stats=['count', 'mean'])
+        pd.testing.assert_frame_equal(
+            short, full[[(element, name) for element in ELEMENTS for name in ('count', 'mean')]])
+
+    def test_index_cached_until_keys_change(self, sample_dataframe):
+        """Test that group codes are reused and rebuilt after a write."""
+        df = sample_dataframe.copy()
+        index = get_group_index(df, 'lithology')
+        assert get_group_index(df, 'lithology') is index
+        df['Au_ppm'] = df['Au_ppm'] * 2
+        assert get_group_index(df, 'lithology') is index
+        df.loc[0, 'lithology'] = 'Dolerite'
+        assert get_group_index(df, 'lithology') is not index
+
+    def test_wrappers(self, sample_dataframe):
+        """Test get_element_by_lithology and get_element_by_hole."""
+        by_lithology = get_element_by_lithology(sample_dataframe, 'Au_ppm')
+        expected = sample_dataframe.groupby('lithology')['Au_ppm'].describe()
+        pd.testing.assert_frame_equal(by_lithology, expected, check_dtype=False,
+                                      check_names=False)
+
+        by_hole = get_element_by_hole(sample_dataframe, 'Au_ppm')
+        expected = sample_dataframe.groupby('hole_id')['Au_ppm'].agg(['mean', 'max', 'count'])
+        pd.testing.assert_frame_equal(by_hole, expected, check_names=False)
@@ -0,0 +1,49 @@
+"""
+Visible tests for the parallel per-hole analysis module.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from geochemical_analyzer import calculate_interval_weighted_mean, get_element_by_hole
+from parallel_analysis import (
+    parallel_element_by_hole,
+    parallel_interval_weighted_mean,
+    run_per_hole,
+)
+
+
+class TestParallelAnalysis:
+    """Tests for running per-hole analysis across worker processes."""
+
+    def test_element_by_hole_matches_serial(self, sample_dataframe):
+        """Test that parallel grouped stats equal the serial groupby."""
+        expected = get_element_by_hole(sample_dataframe, 'Au_ppm')
+        result = parallel_element_by_hole(sample_dataframe, 'Au_ppm', n_workers=2)
+
+        assert list(result.index) == list(expected.index)
+        np.testing.assert_allclose(result.to_numpy(dtype=float),
+                                   expected.to_numpy(dtype=float))
+
+    def test_weighted_mean_matches_serial(self, sample_dataframe):
+        """Test per-hole weighted means against a serial loop."""
+        result = parallel_interval_weighted_mean(sample_dataframe, 'Cu_pct', n_workers=2)
+
+        for hole_id, group in sample_dataframe.groupby('hole_id'):
+            assert result[hole_id] == pytest.approx(
+                calculate_interval_weighted_mean(group, 'Cu_pct'))
+
+    def test_results_independent_of_worker_count(self, sample_dataframe):
+        """Test that results and their order do not depend on the pool size."""
+        serial = run_per_hole(sample_dataframe, calculate_interval_weighted_mean,
+                              'Au_ppm', n_workers=1)
+        parallel = run_per_hole(sample_dataframe, calculate_interval_weighted_mean,
+                                'Au_ppm', n_workers=3)
+
+        assert serial == parallel
@@ -0,0 +1,129 @@
+"""
+Visible tests for the lazy assay pipeline.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from geochemical_analyzer import load_assay_data, filter_by_quality, detect_anomalies
+from data_cleaning import (
+    filter_by_depth_range,
+    handle_missing_values,
+    standardize_lithology_names,
+)
+from pipeline import AssayPipeline
+
+
+@pytest.fixture
+def messy_csv(sample_dataframe, tmp_path):
+    """Write the sample data with inconsistent lithology names."""
+    df = sample_dataframe.copy()
+    df['lithology'] = [name.upper() if i % 3 == 0 else name.lower()
+                       for i, name in enumerate(df['lithology'])]
+    path = tmp_path / "messy.csv"
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+class TestAssayPipeline:
+    """Tests for AssayPipeline against the eager function chain."""
+
+    @pytest.mark.parametrize("strategy", ['drop', 'median', 'zero', 'downhole'])
+    def test_matches_eager_chain(self, messy_csv, strategy):
+        """Test that the optimized plan gives the same rows as the functions."""
+        columns = ['sample_id', 'lithology', 'Au_ppm']
+        result = (AssayPipeline(messy_csv, chunksize=37)
+                  .standardize_lithology_names()
+                  .handle_missing_values(strategy, columns=['Au_ppm'])
+                  .filter_by_quality('Good')
+                  .filter_by_depth_range(max_depth=250)
+                  .detect_anomalies('Au_ppm', 1.5)
+                  .select(columns)
+                  .collect())
+
+        df = load_assay_data(messy_csv)
+        df = standardize_lithology_names(df)
+        df = handle_missing_values(df, strategy, columns=['Au_ppm'])
+        df = filter_by_depth_range(filter_by_quality(df, 'Good'), max_depth=250)
+        expected = detect_anomalies(df, 'Au_ppm', 1.5)[columns]
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_group_fill_runs_on_full_frame(self, messy_csv):
+        """Test that grouped imputation sees every row of each group."""
+        result = (AssayPipeline(messy_csv, chunksize=37)
+                  .handle_missing_values('mean', columns=['Au_ppm'], by='hole_id')
+                  .filter_by_quality('Good')
+                  .collect())
+
+        df = handle_missing_values(load_assay_data(messy_csv), 'mean',
+                                   columns=['Au_ppm'], by='hole_id')
+        pd.testing.assert_frame_equal(result, filter_by_quality(df, 'Good'))
+
+    def test_explain_shows_pushdown(self, messy_csv):
+        """Test that filters and projections are pushed to the scan."""
+        pipeline = (AssayPipeline(messy_csv)
+                    .standardize_lithology_names()
+                    .handle_missing_values('median', columns=['Au_ppm'])
+                    .filter_by_quality('Good')
+                    .detect_anomalies('Au_ppm', 2.0)
+                    .select(['sample_id', 'Au_ppm']))
+        plan = pipeline.explain()
+        # lithology is not selected, so standardizing it is dropped
+        assert "columns: sample_id, Au_ppm, sample_quality" in plan
+        assert "standardize_lithology_names" not in plan
+        # Median imputation needs the whole frame, so the quality filter
+        # cannot move ahead of it
+        assert plan.index("handle_missing_values") < plan.index("sample_quality ==")
+
+        fused = (AssayPipeline(messy_csv).standardize_lithology_names()
+                 .filter_by_quality('Good').filter_by_depth_range(0, 100)
+                 .handle_missing_values('drop', columns=['Au_ppm'])
+                 .handle_missing_values('drop', columns=['Cu_pct']))
+        lines = fused.explain().splitlines()
+        assert lines[2] == ("  where: {'sample_quality': 'Good', "
+                            "'from_depth': (0, None), 'to_depth': (None, 100)}")
+        assert lines[4].startswith("  filter ") and "&" in lines[4]
+        assert lines[5] == "  standardize_lithology_names"
+
+    def test_pipeline_is_immutable(self, messy_csv):
+        """Test that recording a step returns a new pipeline."""
+        base = AssayPipeline(messy_csv)
+        filtered = base.filter_by_quality('Good')
+        assert len(base.collect()) > len(filtered.collect())
+
+    def test_missing_file(self):
+        """Test that a missing file gives None, like load_assay_data."""
+        assert AssayPipeline('nonexistent_file.csv').collect() is None
+
+
+class TestBaseCleaning:
+    """Tests for handle_missing_values and standardize_lithology_names."""
+
+    @pytest.mark.parametrize("strategy", ['mean', 'median', 'zero'])
+    def test_fill_strategies(self, sample_dataframe, strategy):
+        """Test that filled columns have no gaps and other values are kept."""
+        result = handle_missing_values(sample_dataframe, strategy, columns=['Au_ppm'])
+        assert result['Au_ppm'].notna().all()
+        known = sample_dataframe['Au_ppm'].notna()
+        assert np.allclose(result.loc[known, 'Au_ppm'], sample_dataframe.loc[known, 'Au_ppm'])
+
+    def test_unknown_strategy(self, sample_dataframe):
+        """Test that an unknown strategy raises ValueError."""
+        with pytest.raises(ValueError):
+            handle_missing_values(sample_dataframe, 'nearest')
+
+    def test_categorical_lithology_merged(self, messy_csv):
+        """Test that differently cased categories collapse into one."""
+        df = load_assay_data(messy_csv)
+        result = standardize_lithology_names(df)
+        assert set(result['lithology'].cat.categories) == \
+            set(df['lithology'].str.title().unique())
+        assert list(result['lithology'].astype(str)) == \
+            list(df['lithology'].astype(str).str.title())
@@ -0,0 +1,152 @@
+"""
+Visible tests for memoized analysis results.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from geochemical_analyzer import calculate_element_statistics, correlate_elements
+from data_cleaning import validate_data_quality
+from result_cache import ResultCache, frame_fingerprint, memoize
+
+
+def element_columns(df, element, *args, **kwargs):
+    return [element]
+
+
+@pytest.fixture
+def cache():
+    return ResultCache()
+
+
+@pytest.fixture
+def stats(cache):
+    return memoize(calculate_element_statistics, element_columns, cache)
+
+
+class TestResultCache:
+    """Tests for ResultCache and memoize."""
+
+    def test_repeat_call_hits(self, sample_dataframe, cache, stats):
+        """Test that a repeated call is served from the cache."""
+        first = stats(sample_dataframe, 'Au_ppm')
+        second = stats(sample_dataframe, 'Au_ppm', quantiles='auto')
+        assert first == second == calculate_element_statistics(sample_dataframe, 'Au_ppm')
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        stats(sample_dataframe, 'Cu_pct')
+        assert cache.misses == 2
+
+    def test_results_are_copies(self, sample_dataframe, stats):
+        """Test that modifying a returned result does not change the cache."""
+        stats(sample_dataframe, 'Au_ppm')['mean'] = -1
+        assert stats(sample_dataframe, 'Au_ppm')['mean'] != -1
+
+    def test_frame_results_are_not_copied(self, sample_dataframe, cache):
+        """Test that hits share data with the cache but cannot change it."""
+        doubled = memoize(double_column, element_columns, cache)
+        first = doubled(sample_dataframe, 'Au_ppm')
+        second = doubled(sample_dataframe, 'Au_ppm')
+        assert np.shares_memory(first['Au_ppm'].to_numpy(), second['Au_ppm'].to_numpy())
+
+        second.iloc[0, 0] = -1.0
+        assert doubled(sample_dataframe, 'Au_ppm').iloc[0, 0] == first.iloc[0, 0]
+
+    def test_array_arguments_keyed_by_value(self, sample_dataframe, cache):
+        """Test that arrays with the same abbreviated repr get different keys."""
+        above = memoize(count_above, element_columns, cache)
+        low = np.zeros(5000)
+        high = low.copy()
+        high[2500] = 1e9
+        assert repr(low) == repr(high)
+
+        assert above(sample_dataframe, 'Au_ppm', low) != above(sample_dataframe, 'Au_ppm', high)
+        assert cache.misses == 2
+
+    def test_timings_not_cached(self, sample_dataframe, cache):
+        """Test that a hit does not report the timings of the first run."""
+        validate = memoize(validate_data_quality, lambda df: None, cache,
+                           volatile=('timings',))
+        first = validate(sample_dataframe)
+        second = validate(sample_dataframe)
+
+        assert 'timings' in first and 'timings' not in second
+        assert cache.hits == 1
+        assert {key: value for key, value in first.items() if key != 'timings'} == second
+
+    def test_changed_column_misses(self, sample_dataframe, cache, stats):
+        """Test that only changes to the columns read affect the key."""
+        df = sample_dataframe.copy()
+        stats(df, 'Au_ppm')
+        df['Cu_pct'] = df['Cu_pct'] + 1
+        stats(df, 'Au_ppm')
+        assert cache.hits == 1
+
+        df['Au_ppm'] = df['Au_ppm'] * 2
+        result = stats(df, 'Au_ppm')
+        assert cache.misses == 2
+        assert result['mean'] == pytest.approx(2 * sample_dataframe['Au_ppm'].mean())
+
+    def test_equal_copy_shares_fingerprint(self, sample_dataframe):
+        """Test that the fingerprint depends on values, not on the object."""
+        copy = sample_dataframe.copy()
+        copy.index = copy.index + 1000
+        assert frame_fingerprint(copy) == frame_fingerprint(sample_dataframe)
+        assert frame_fingerprint(copy, ['Au_ppm']) != frame_fingerprint(copy, ['Cu_pct'])
+
+    def test_lru_eviction_within_budget(self, sample_dataframe):
+        """Test that the least recently used result is evicted first."""
+        cache = ResultCache(max_bytes=2 * cache_size(sample_dataframe))
+        stats = memoize(calculate_element_statistics, element_columns, cache)
+        stats(sample_dataframe, 'Au_ppm')
+        stats(sample_dataframe, 'Cu_pct')
+        stats(sample_dataframe, 'Au_ppm')
+        stats(sample_dataframe, 'Ag_ppm')
+        assert cache.evictions == 1
+        assert cache.total_bytes <= cache.max_bytes
+        stats(sample_dataframe, 'Au_ppm')
+        assert cache.stats()['hits'] == 2
+
+    def test_invalidate(self, sample_dataframe, cache, stats):
+        """Test dropping results by frame, by function and all at once."""
+        correlate = memoize(correlate_elements, lambda df, a, b: [a, b], cache)
+        validate = memoize(validate_data_quality, lambda df: None, cache)
+        other = sample_dataframe.copy()
+        other['Au_ppm'] = other['Au_ppm'] + 1
+
+        stats(sample_dataframe, 'Au_ppm')
+        stats(other, 'Au_ppm')
+        correlate(sample_dataframe, 'Au_ppm', 'Cu_pct')
+        report = validate(sample_dataframe)
+        assert report['duplicate_ids'] == validate_data_quality(sample_dataframe)['duplicate_ids']
+
+        assert cache.invalidate(df=other) == 1
+        assert cache.invalidate(func=calculate_element_statistics) == 1
+        assert cache.invalidate() == 2
+        assert len(cache) == 0 and cache.total_bytes == 0
+
+    def test_chunk_streams_pass_through(self, sample_dataframe, cache, stats):
+        """Test that non-DataFrame input is not cached."""
+        stats([sample_dataframe.iloc[:100], sample_dataframe.iloc[100:]], 'Au_ppm')
+        assert len(cache) == 0
+
+
+def double_column(df, element):
+    return df[[element]] * 2
+
+
+def count_above(df, element, cutoffs):
+    return int((df[element].to_numpy()[:, None] > cutoffs).sum())
+
+
+def cache_size(df):
+    """Size of one cached statistics result."""
+    cache = ResultCache()
+    memoize(calculate_element_statistics, element_columns, cache)(df, 'Au_ppm')
+    return cache.total_bytes
@@ -0,0 +1,72 @@
+"""
+Visible tests for lazy row selections.
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from geochemical_analyzer import filter_by_quality
+from data_cleaning import filter_by_depth_range, remove_outliers
+from selection import Selection
+
+
+class TestSelection:
+    """Tests for Selection against the equivalent DataFrame filter chains."""
+
+    @pytest.mark.parametrize("method,threshold", [('iqr', 1.5), ('zscore', 1.0)])
+    def test_chain_matches_filters(self, sample_dataframe, method, threshold):
+        """Test that a chained selection gives the same rows as the filters."""
+        df = sample_dataframe
+        expected = remove_outliers(
+            filter_by_depth_range(filter_by_quality(df, 'Good'), max_depth=80),
+            'Au_ppm', method=method, threshold=threshold)
+
+        selection = (Selection(df).quality('Good').depth_range(max_depth=80)
+                     .without_outliers('Au_ppm', method=method, threshold=threshold))
+        pd.testing.assert_frame_equal(selection.materialize(), expected)
+        assert len(selection) == len(expected)
+
+    def test_several_elements(self, sample_dataframe):
+        """Test outlier removal over several elements with the 'all' rule."""
+        df = sample_dataframe
+        elements = ['Au_ppm', 'Cu_pct']
+        expected = remove_outliers(filter_by_quality(df, 'Good'), elements, rule='all')
+
+        selection = Selection(df).quality('Good').without_outliers(elements, rule='all')
+        pd.testing.assert_frame_equal(selection.materialize(), expected)
+
+    def test_index_and_scan_agree(self, sample_dataframe):
+        """Test that depth_range gives the same mask with and without the index."""
+        df = sample_dataframe
+        scan = Selection(df).depth_range(20, 60)
+        indexed = Selection(df).depth_range(20, 60, use_index=True)
+        assert np.array_equal(scan.mask, indexed.mask)
+
+    def test_values_and_positions(self, sample_dataframe):
+        """Test column access without materializing the frame."""
+        df = sample_dataframe
+        selection = Selection(df).quality('Good')
+        rows = selection.positions()
+        assert np.allclose(selection.values('Au_ppm'), df['Au_ppm'].to_numpy()[rows],
+                           equal_nan=True)
+        subset = selection.materialize(columns=['sample_id', 'Au_ppm'])
+        assert list(subset.columns) == ['sample_id', 'Au_ppm']
+        assert list(subset.index) == list(df.index[rows])
+
+    def test_original_untouched(self, sample_dataframe):
+        """Test that selecting does not modify the DataFrame."""
+        df = sample_dataframe
+        before = df.copy()
+        Selection(df).quality('Good').without_outliers('Au_ppm').materialize()
+        pd.testing.assert_frame_equal(df, before)
+
+    def test_mask_length_checked(self, sample_dataframe):
+        """Test that a mask of the wrong length is rejected."""
+        with pytest.raises(ValueError):
+            Selection(sample_dataframe, mask=[True])
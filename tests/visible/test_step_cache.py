@@ -0,0 +1,118 @@
+"""
+Visible tests for the on-disk workflow step cache.
+"""
+
+import pytest
+import pandas as pd
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from geochemical_analyzer import calculate_element_statistics, filter_by_quality
+from step_cache import StepCache
+
+
+def run_workflow(cache_dir, df, data_hash, quality='Good', element='Au_ppm', force=False):
+    """A two-step workflow: filter, then statistics on the filtered frame."""
+    steps = StepCache(str(cache_dir), force=force)
+    steps.add_input('data', data_hash, frame=df)
+    filtered = steps.run('filtered', filter_by_quality, df, quality, depends=['data'])
+    stats = steps.run('statistics', calculate_element_statistics, filtered, element,
+                      depends=['filtered'])
+    return steps, filtered, stats
+
+
+class TestStepCache:
+    """Tests for StepCache."""
+
+    def test_second_run_reuses_everything(self, sample_dataframe, tmp_path):
+        """Test that an unchanged re-run loads every step from disk."""
+        first, filtered, stats = run_workflow(tmp_path, sample_dataframe, 'v1')
+        assert first.executed == ['filtered', 'statistics']
+
+        second, cached_filtered, cached_stats = run_workflow(tmp_path, sample_dataframe, 'v1')
+        assert second.executed == [] and second.reused == ['filtered', 'statistics']
+        pd.testing.assert_frame_equal(cached_filtered, filtered)
+        assert cached_stats == stats
+
+    def test_only_changed_steps_rerun(self, sample_dataframe, tmp_path):
+        """Test that a parameter change reruns that step and the ones below."""
+        run_workflow(tmp_path, sample_dataframe, 'v1')
+        steps, _, _ = run_workflow(tmp_path, sample_dataframe, 'v1', element='Cu_pct')
+        assert steps.reused == ['filtered'] and steps.executed == ['statistics']
+
+        steps, _, _ = run_workflow(tmp_path, sample_dataframe, 'v1', quality='Fair')
+        assert steps.executed == ['filtered', 'statistics']
+
+    def test_input_change_and_force(self, sample_dataframe, tmp_path):
+        """Test that a new data hash or force reruns everything."""
+        run_workflow(tmp_path, sample_dataframe, 'v1')
+        steps, _, _ = run_workflow(tmp_path, sample_dataframe, 'v2')
+        assert steps.executed == ['filtered', 'statistics']
+        steps, _, _ = run_workflow(tmp_path, sample_dataframe, 'v2', force=True)
+        assert steps.executed == ['filtered', 'statistics']
+        # Old results of a step are replaced, not accumulated
+        assert len(list(tmp_path.glob('filtered-*.pkl'))) == 1
+
+    def test_corrupt_file_is_recomputed(self, sample_dataframe, tmp_path):
+        """Test that an unreadable cache file counts as a miss."""
+        run_workflow(tmp_path, sample_dataframe, 'v1')
+        for path in tmp_path.glob('statistics-*.pkl'):
+            path.write_bytes(b'not a pickle')
+        steps, _, stats = run_workflow(tmp_path, sample_dataframe, 'v1')
+        assert steps.executed == ['statistics']
+        assert stats['count'] > 0
+
+    def test_untracked_frame_keyed_by_values(self, sample_dataframe, tmp_path):
+        """Test that a frame no step produced is keyed by its contents."""
+        StepCache(str(tmp_path)).run('statistics', calculate_element_statistics,
+                                     sample_dataframe, 'Au_ppm')
+        steps = StepCache(str(tmp_path))
+        steps.run('statistics', calculate_element_statistics,
+                  sample_dataframe.copy(), 'Au_ppm')
+        assert steps.reused == ['statistics']
+
+        changed = sample_dataframe.copy()
+        changed['Au_ppm'] = changed['Au_ppm'] * 2
+        steps.run('statistics', calculate_element_statistics, changed, 'Au_ppm')
+        assert steps.executed == ['statistics']
+
+    def test_missing_dependency_raises(self, sample_dataframe, tmp_path):
+        """Test that a tracked frame must be listed in depends."""
+        steps = StepCache(str(tmp_path))
+        steps.add_input('data', 'v1', frame=sample_dataframe)
+        filtered = steps.run('filtered', filter_by_quality, sample_dataframe, 'Good',
+                             depends=['data'])
+
+        with pytest.raises(ValueError, match="'filtered'"):
+            steps.run('statistics', calculate_element_statistics, filtered, 'Au_ppm',
+                      depends=['data'])
+        with pytest.raises(ValueError, match="unknown"):
+            steps.run('statistics', calculate_element_statistics, filtered, 'Au_ppm',
+                      depends=['filterd'])
+
+    def test_helper_module_edit_invalidates(self, tmp_path, monkeypatch):
+        """Test that editing a module the step's module imports reruns the step."""
+        package = tmp_path / "project"
+        package.mkdir()
+        (package / "step_helper.py").write_text("def scale(x):\n    return x * 2\n")
+        (package / "step_module.py").write_text(
+            "from step_helper import scale\n\n\ndef step(x):\n    return scale(x)\n")
+        monkeypatch.syspath_prepend(str(package))
+        import step_module
+
+        cache_dir = tmp_path / "cache"
+        steps = StepCache(str(cache_dir))
+        assert steps.run('double', step_module.step, 3) == 6
+        steps = StepCache(str(cache_dir))
+        steps.run('double', step_module.step, 3)
+        assert steps.reused == ['double']
+
+        (package / "step_helper.py").write_text("def scale(x):\n    return x * 3\n")
+        steps = StepCache(str(cache_dir))
+        steps.run('double', step_module.step, 3)
+        assert steps.executed == ['double']
+        monkeypatch.delitem(sys.modules, 'step_module')
+        monkeypatch.delitem(sys.modules, 'step_helper')
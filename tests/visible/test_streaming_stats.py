@@ -0,0 +1,216 @@
+"""
+Visible tests for the streaming statistics module.
+"""
+
+import json
+
+import pytest
+import pandas as pd
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+from streaming_stats import (
+    CoMomentAccumulator,
+    IncrementalAnomalyDetector,
+    MomentAccumulator,
+    QuantileSketch,
+)
+from geochemical_analyzer import (
+    calculate_element_statistics,
+    correlate_elements,
+    detect_anomalies,
+)
+
+
+ELEMENTS = ['Au_ppm', 'Cu_pct', 'Ag_ppm']
+
+
+class TestMomentAccumulator:
+    """Tests for the mergeable moment accumulator."""
+
+    def test_batches_match_full_frame(self, sample_dataframe):
+        """Test that batched updates give the whole-frame statistics."""
+        acc = MomentAccumulator(ELEMENTS)
+        for start in range(0, len(sample_dataframe), 6):
+            acc.update(sample_dataframe.iloc[start:start + 6])
+        result = acc.statistics()
+
+        for element in ELEMENTS:
+            expected = calculate_element_statistics(sample_dataframe, element)
+            for key in ['count', 'mean', 'std', 'min', 'max']:
+                assert result[element][key] == pytest.approx(expected[key])
+            assert result[element]['missing'] == sample_dataframe[element].isna().sum()
+
+    def test_merge_is_exact(self, sample_dataframe):
+        """Test that merging partial accumulators equals one accumulator."""
+        half = len(sample_dataframe) // 3
+        left = MomentAccumulator(ELEMENTS).update(sample_dataframe.iloc[:half])
+        right = MomentAccumulator(ELEMENTS).update(sample_dataframe.iloc[half:])
+        whole = MomentAccumulator(ELEMENTS).update(sample_dataframe)
+
+        merged = right.merge(left).statistics()
+        for element in ELEMENTS:
+            for key, value in whole.statistics()[element].items():
+                assert merged[element][key] == pytest.approx(value)
+
+    def test_json_round_trip(self, sample_dataframe):
+        """Test that accumulator state survives JSON serialization."""
+        acc = MomentAccumulator(ELEMENTS + ['S_pct'])
+        acc.update(sample_dataframe.iloc[:4])
+        empty = MomentAccumulator(['Au_ppm'])
+
+        restored = MomentAccumulator.from_dict(json.loads(json.dumps(acc.to_dict())))
+        restored_empty = MomentAccumulator.from_dict(
+            json.loads(json.dumps(empty.to_dict())))
+
+        for element, stats in acc.statistics().items():
+            assert restored.statistics()[element] == pytest.approx(stats)
+        assert restored_empty.statistics()['Au_ppm']['count'] == 0
+
+    def test_rejects_mismatched_merge(self):
+        """Test that accumulators for different elements cannot be merged."""
+        with pytest.raises(ValueError):
+            MomentAccumulator(['Au_ppm']).merge(MomentAccumulator(['Cu_pct']))
+
+
+class TestCoMomentAccumulator:
+    """Tests for streaming correlation."""
+
+    def test_batches_match_pandas(self, sample_dataframe):
+        """Test that batched co-moments give the pandas correlation."""
+        acc = CoMomentAccumulator('Au_ppm', 'Cu_pct')
+        for start in range(0, len(sample_dataframe), 9):
+            acc.update(sample_dataframe.iloc[start:start + 9])
+
+        expected = correlate_elements(sample_dataframe, 'Au_ppm', 'Cu_pct')
+        assert acc.correlation() == pytest.approx(expected)
+
+    def test_merge_and_round_trip(self, sample_dataframe):
+        """Test that partial accumulators from workers combine exactly."""
+        parts = np.array_split(np.arange(len(sample_dataframe)), 3)
+        accs = [CoMomentAccumulator('Ag_ppm', 'Au_ppm').update(sample_dataframe.iloc[p])
+                for p in parts]
+        merged = CoMomentAccumulator.from_dict(json.loads(json.dumps(accs[0].to_dict())))
+        for acc in accs[1:]:
+            merged.merge(acc)
+
+        expected = correlate_elements(sample_dataframe, 'Ag_ppm', 'Au_ppm')
+        assert merged.correlation() == pytest.approx(expected)
+
+    def test_correlate_elements_on_chunks(self, sample_dataframe):
+        """Test that correlate_elements accepts a chunk stream."""
+        chunks = (sample_dataframe.iloc[i:i + 11]
+                  for i in range(0, len(sample_dataframe), 11))
+
+        result = correlate_elements(chunks, 'Fe_pct', 'S_pct')
+        assert result == pytest.approx(
+            correlate_elements(sample_dataframe, 'Fe_pct', 'S_pct'))
+
+
+@pytest.fixture(scope="module")
+def values():
+    """Return a heavy-tailed sample like gold grades."""
+    return np.random.default_rng(42).lognormal(sigma=1.5, size=200_000)
+
+
+class TestQuantileSketch:
+    """Tests for the mergeable quantile sketch."""
+
+    QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+    def _rank_error(self, values, estimates):
+        """Return the largest normalized rank error of the estimates."""
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        return np.abs(ranks - np.array(self.QUANTILES)).max()
+
+    def test_small_input_is_exact(self, sample_dataframe):
+        """Test that the sketch is exact before any compaction."""
+        values = sample_dataframe['Au_ppm'].iloc[:50]
+        result = QuantileSketch().update(values).quantile(self.QUANTILES)
+
+        assert result == pytest.approx(values.quantile(self.QUANTILES).to_numpy())
+
+    def test_error_bound_and_memory(self, values):
+        """Test the documented rank error and bounded memory."""
+        sketch = QuantileSketch(k=200)
+        for batch in np.array_split(values, 50):
+            sketch.update(batch)
+
+        assert self._rank_error(values, sketch.quantile(self.QUANTILES)) < 4 / 200
+        assert sum(len(items) for items in sketch.levels) < 3 * 200
+        assert sketch.quantile(0.0) == values.min()
+        assert sketch.quantile(1.0) == values.max()
+
+    @pytest.mark.parametrize("batch_size", [10, 1000])
+    @pytest.mark.parametrize("seed", [0, 1, 2])
+    def test_documented_bound_on_shuffled_stream(self, seed, batch_size):
+        """Test the documented 4 / k bound over 99 quantiles of a long stream."""
+        n = 200_000
+        values = np.random.default_rng(seed).permutation(n).astype(float)
+        sketch = QuantileSketch(k=200, seed=seed)
+        for start in range(0, n, batch_size):
+            sketch.update(values[start:start + batch_size])
+
+        quantiles = np.linspace(0.01, 0.99, 99)
+        # values are 0..n-1, so an estimate v has rank (v + 1) / n
+        ranks = (sketch.quantile(quantiles) + 1) / n
+        assert np.abs(ranks - quantiles).max() < 4 / 200
+
+    def test_merge_and_round_trip(self, values):
+        """Test that merged and restored sketches stay within the bound."""
+        parts = [QuantileSketch(seed=i).update(batch)
+                 for i, batch in enumerate(np.array_split(values, 4))]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(QuantileSketch.from_dict(json.loads(json.dumps(part.to_dict()))))
+
+        assert merged.n == len(values)
+        assert self._rank_error(values, merged.quantile(self.QUANTILES)) < 4 / 200
+
+
+class TestIncrementalAnomalyDetector:
+    """Tests for anomaly detection on appended batches."""
+
+    def test_tracks_full_recomputation(self, sample_dataframe):
+        """Test that reported changes reproduce detect_anomalies on all data."""
+        detector = IncrementalAnomalyDetector(['Au_ppm', 'Cu_pct'], 2.0)
+        flagged = {'Au_ppm': set(), 'Cu_pct': set()}
+
+        for start in range(0, len(sample_dataframe), 7):
+            changes = detector.update(sample_dataframe.iloc[start:start + 7])
+            seen = sample_dataframe.iloc[:start + 7]
+            for element, change in changes.items():
+                flagged[element] |= set(change['new_anomalies'])
+                flagged[element] |= set(change['newly_flagged'])
+                flagged[element] -= set(change['cleared'])
+
+                expected = set(detect_anomalies(seen, element, 2.0)['sample_id'])
+                assert flagged[element] == expected
+                assert set(detector.anomalies(element)) == expected
+
+    def test_threshold_drop_flags_history(self):
+        """Test that a falling threshold flags earlier samples."""
+        detector = IncrementalAnomalyDetector('Au_ppm', 1.0)
+        detector.update(pd.DataFrame({'sample_id': ['A', 'B', 'C', 'D'],
+                                      'Au_ppm': [0.0, 0.0, 10.0, 20.0]}))
+        changes = detector.update(pd.DataFrame({'sample_id': list('EFGHIJKLMN'),
+                                                'Au_ppm': [0.0] * 10}))['Au_ppm']
+
+        assert changes['threshold'] < changes['previous_threshold']
+        assert set(changes['newly_flagged']) == {'C'}
+        assert len(changes['new_anomalies']) == 0
+
+    def test_first_finite_threshold_flags_history(self):
+        """Test that samples seen before there was a threshold get flagged."""
+        detector = IncrementalAnomalyDetector('Au_ppm', 0.5)
+        first = detector.update(pd.DataFrame({'sample_id': ['a'], 'Au_ppm': [100.0]}))
+        changes = detector.update(pd.DataFrame({'sample_id': ['b', 'c'],
+                                                'Au_ppm': [1.0, 2.0]}))['Au_ppm']
+
+        assert np.isnan(first['Au_ppm']['threshold'])
+        assert np.isnan(changes['previous_threshold'])
+        assert set(changes['newly_flagged']) == set(detector.anomalies('Au_ppm')) == {'a'}